@@ -0,0 +1,155 @@
+import bisect
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config import ARCHIVE_PATH, ARCHIVE_INDEX_PATH
+from cusTypes.record import DailyRecord
+from cusTypes.version import Version
+from platforms import Platform
+
+
+def record_to_entry(record: DailyRecord, recorded_at: str) -> dict:
+    return {
+        "version": str(record["version"]),
+        "fetched_at": record["fetched_at"],
+        "recorded_at": recorded_at,
+        "platforms": record["platforms"],
+        "checksums": {
+            platform.name: digest for platform, digest in record["checksums"].items()
+        },
+    }
+
+
+def entry_to_record(entry: dict) -> DailyRecord:
+    return DailyRecord(
+        version=Version.from_string(entry["version"]),
+        fetched_at=entry["fetched_at"],
+        platforms=int(entry["platforms"]),
+        checksums={
+            Platform[name]: digest for name, digest in entry.get("checksums", {}).items()
+        },
+    )
+
+
+class Archive:
+    """Append-only JSON Lines archive of every daily ever seen.
+
+    Each line is one observation of a version; a later line for the same
+    version supersedes earlier ones. A small sidecar index maps each version
+    to the byte offset of its latest line and keeps (fetched_at, version)
+    pairs sorted, so single-version lookups and date-range queries only read
+    the lines they return.
+    """
+
+    def __init__(
+        self, path: Path = ARCHIVE_PATH, index_path: Path = ARCHIVE_INDEX_PATH
+    ) -> None:
+        self.path = path
+        self.index_path = index_path
+        self._offsets: dict[str, int] = {}
+        self._by_date: list[tuple[str, str]] = []
+        self._load_index()
+
+    def _data_size(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def _load_index(self) -> None:
+        try:
+            with self.index_path.open("r", encoding="utf-8") as index_file:
+                index = json.load(index_file)
+            if index.get("size") == self._data_size():
+                self._offsets = dict(index["offsets"])
+                self._by_date = [tuple(pair) for pair in index["by_date"]]
+                return
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        self.rebuild_index()
+
+    def rebuild_index(self) -> None:
+        """Rebuild the index with one sequential scan of the archive."""
+        self._offsets = {}
+        fetched: dict[str, str] = {}
+        if self.path.exists():
+            with self.path.open("rb") as data_file:
+                offset = 0
+                for line in data_file:
+                    try:
+                        entry = json.loads(line)
+                        self._offsets[entry["version"]] = offset
+                        fetched[entry["version"]] = entry["fetched_at"]
+                    except (ValueError, KeyError):
+                        pass
+                    offset += len(line)
+        self._by_date = sorted((at, version) for version, at in fetched.items())
+
+    def save_index(self) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.index_path.with_suffix(".part")
+        with temporary.open("w", encoding="utf-8") as index_file:
+            json.dump(
+                {
+                    "size": self._data_size(),
+                    "offsets": self._offsets,
+                    "by_date": self._by_date,
+                },
+                index_file,
+                separators=(",", ":"),
+            )
+        os.replace(temporary, self.index_path)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, version: Version) -> bool:
+        return str(version) in self._offsets
+
+    def _read_at(self, data_file, offset: int) -> DailyRecord:
+        data_file.seek(offset)
+        return entry_to_record(json.loads(data_file.readline()))
+
+    def get(self, version: Version) -> DailyRecord | None:
+        """Return the latest archived record of `version`, if any."""
+        offset = self._offsets.get(str(version))
+        if offset is None:
+            return None
+        with self.path.open("rb") as data_file:
+            return self._read_at(data_file, offset)
+
+    def between(self, start: str, end: str) -> list[DailyRecord]:
+        """Return records first seen in [start, end] (ISO 8601 UTC strings)."""
+        low = bisect.bisect_left(self._by_date, (start, ""))
+        high = bisect.bisect_right(self._by_date, (end, "\uffff"))
+        if low >= high:
+            return []
+        with self.path.open("rb") as data_file:
+            return [
+                self._read_at(data_file, self._offsets[version])
+                for _, version in self._by_date[low:high]
+            ]
+
+    def append(self, records: list[DailyRecord]) -> None:
+        """Append records as new observations and update the index in memory."""
+        if not records:
+            return
+        recorded_at = (
+            datetime.now(timezone.utc)
+            .replace(microsecond=0)
+            .isoformat()
+            .replace("+00:00", "Z")
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as data_file:
+            offset = data_file.tell()
+            for record in records:
+                line = (
+                    json.dumps(record_to_entry(record, recorded_at), separators=(",", ":"))
+                    + "\n"
+                ).encode("utf-8")
+                data_file.write(line)
+                version = str(record["version"])
+                if version not in self._offsets:
+                    bisect.insort(self._by_date, (record["fetched_at"], version))
+                self._offsets[version] = offset
+                offset += len(line)
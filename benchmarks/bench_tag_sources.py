@@ -0,0 +1,64 @@
+"""Compare the REST and GraphQL tag sources offline against the stub GitHub API.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_tag_sources [--tags 400] [--latency 0.05]
+
+Both sources must agree on the newest versions; the script reports how many
+requests and how long each one needed, cold (empty ETag cache) and warm.
+"""
+
+import argparse
+import time
+
+from tests.stub_server import GitHubHandler, StubServer  # sets a temporary CACHE_DIR
+
+from cusTypes.version import Version
+from git import GraphQLTagSource, RestTagSource, fetch_latest_versions
+
+
+def synthetic_tags(count: int) -> list[str]:
+    """`count` daily tags spread over monthly releases, newest first."""
+    per_release = 150
+    tags = [
+        f"2026.{1 + index // per_release:02d}.0-{1 + index % per_release}"
+        for index in range(count)
+    ]
+    return [str(version) for version in sorted(Version.parse_many(tags), reverse=True)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tags", type=int, default=400)
+    parser.add_argument("--wanted", type=int, default=30)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="simulated seconds per API call"
+    )
+    args = parser.parse_args()
+
+    tags = synthetic_tags(args.tags)
+    expected = sorted(Version.parse_many(tags), reverse=True)[: args.wanted]
+
+    with StubServer(GitHubHandler, tags=tags, latency=args.latency) as server:
+        for name, source in (
+            ("rest", RestTagSource(server.url, args.per_page)),
+            ("graphql", GraphQLTagSource(server.url, args.per_page)),
+        ):
+            for run in ("cold", "warm"):
+                before = len(server.requests)
+                start = time.perf_counter()
+                versions = fetch_latest_versions(args.wanted, None, source)
+                elapsed = time.perf_counter() - start
+                status = "ok" if versions == expected else "MISMATCH"
+                print(
+                    f"{name:8} {run}: {len(server.requests) - before:3d} requests, "
+                    f"{elapsed * 1000:7.1f} ms, {status}"
+                )
+                if versions != expected:
+                    return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+"""Microbenchmark version parsing over a synthetic 10k-tag list.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_version_parse [--tags 10000] [--repeat 5]
+
+Compares a naive per-tag parse (pattern looked up on every call, a fresh
+Version per tag, exceptions for non-daily tags) with Version.parse_many,
+cold (empty intern cache) and warm. Times are the best of --repeat runs.
+"""
+
+import argparse
+import random
+import re
+import time
+from collections.abc import Callable
+
+from cusTypes.version import VERSION_RE, Version, _intern
+
+
+def synthetic_tags(count: int, seed: int = 0) -> list[str]:
+    """`count` tag names: ~90% dailies over several releases, the rest other tags."""
+    rng = random.Random(seed)
+    tags = []
+    for index in range(count):
+        if rng.random() < 0.1:
+            tags.append(rng.choice(["v", "release-", "latest-"]) + str(index))
+        else:
+            month = 1 + index % 12
+            tags.append(f"{2020 + index // 2000}.{month:02d}.0-{index % 500}")
+    rng.shuffle(tags)
+    return tags
+
+
+def naive_parse(tags: list[str]) -> list[Version]:
+    versions = []
+    for tag in tags:
+        try:
+            match = re.fullmatch(VERSION_RE.pattern, tag)
+            if match is None:
+                raise ValueError(tag)
+            versions.append(Version(*match.groups()))
+        except ValueError:
+            pass
+    return versions
+
+
+def cold_parse_many(tags: list[str]) -> list[Version]:
+    _intern.cache_clear()
+    return Version.parse_many(tags)
+
+
+def best_of(function: Callable[[list[str]], list[Version]], tags: list[str], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(tags)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tags", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tags = synthetic_tags(args.tags)
+    if naive_parse(tags) != cold_parse_many(tags):
+        print("parse_many disagrees with the naive parser")
+        return 1
+
+    Version.parse_many(tags)  # warm the intern cache
+    for name, function in (
+        ("naive per-tag parse", naive_parse),
+        ("parse_many (cold)", cold_parse_many),
+        ("parse_many (warm)", Version.parse_many),
+    ):
+        elapsed = best_of(function, tags, args.repeat)
+        print(f"{name:20} {elapsed * 1000:8.2f} ms for {len(tags)} tags")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import argparse
+import glob
 import gzip
 import hashlib
+import io
 import json
 import os
 import shutil
 import subprocess
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -15,7 +18,13 @@ from urllib.parse import urlparse
 
 import requests
 
+from compress import precompress_all, print_stats, write_if_changed
+from config import APT_CACHE_DIR, APT_CACHE_MAX_BYTES
 from cusTypes.version import Version
+from debpkg import packages_stanza, parse_control, read_control
+from download_cache import DownloadCache, link_or_copy
+from helper import report_output_status
+from http_client import get_session
 
 
 DEBIAN_SYSTEM_NAME = "Debian/Ubuntu Linux"
@@ -24,6 +33,15 @@ ARCHITECTURES = {
     "ARM": "arm64",
 }
 PUBLIC_KEY_FILE = "positron-daily-archive-keyring.asc"
+POOL_PATH = "pool/main/p/positron"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_ATTEMPTS = 5
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+RELEASE_FIELDS = ("MD5Sum", "SHA1", "SHA256")
+RELEASE_ALGORITHMS = ("md5", "sha1", "sha256")
+# Index generations kept under by-hash/ so clients holding an older InRelease
+# can still fetch the indices it lists while a new deploy propagates.
+BY_HASH_GENERATIONS = 3
 
 
 @dataclass(frozen=True)
@@ -32,6 +50,7 @@ class DebPackage:
     arch_label: str
     debian_arch: str
     url: str
+    sha256: str | None = None
 
     @property
     def filename(self) -> str:
@@ -45,7 +64,19 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--data", type=Path, default=Path("dailies.json"))
     parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument(
+        "--state",
+        type=Path,
+        default=None,
+        help="Manifest of the previous build (default: <output>.state.json next to the output).",
+    )
     parser.add_argument("--repo-path", default="apt")
+    parser.add_argument(
+        "--keep",
+        type=int,
+        default=1,
+        help="Number of most recent dailies kept in the pool per architecture.",
+    )
     parser.add_argument("--suite", default="stable")
     parser.add_argument("--component", default="main")
     parser.add_argument("--base-url", default="")
@@ -53,6 +84,25 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--label", default="Positron Daily Builds")
     parser.add_argument("--public-key", type=Path, default=Path(PUBLIC_KEY_FILE))
     parser.add_argument("--signing-key", default=os.environ.get("APT_SIGNING_KEY_ID"))
+    parser.add_argument("--cache-dir", type=Path, default=APT_CACHE_DIR)
+    parser.add_argument(
+        "--cache-max-bytes",
+        type=int,
+        default=APT_CACHE_MAX_BYTES,
+        help="Size budget of the download cache; least recently used packages are evicted beyond it.",
+    )
+    parser.add_argument(
+        "--download-workers",
+        type=int,
+        default=4,
+        help="Number of packages downloaded concurrently.",
+    )
+    parser.add_argument(
+        "--download-segments",
+        type=int,
+        default=1,
+        help="Split each package into up to this many parallel byte-range requests.",
+    )
     return parser.parse_args()
 
 
@@ -71,100 +121,339 @@ def load_versions(path: Path) -> list[dict[str, Any]]:
     )
 
 
-def select_latest_debs(versions: list[dict[str, Any]]) -> list[DebPackage]:
+def select_latest_debs(
+    versions: list[dict[str, Any]], keep: int = 1
+) -> list[DebPackage]:
+    """Return the newest `keep` Debian packages of each architecture.
+
+    `versions` must be sorted newest first (see `load_versions`).
+    """
     packages: list[DebPackage] = []
 
     for arch_label, debian_arch in ARCHITECTURES.items():
+        selected = 0
         for item in versions:
+            if selected >= keep:
+                break
             version = Version.from_string(str(item["version"]))
             downloads = item.get("downloads", {})
             debian_downloads = downloads.get(DEBIAN_SYSTEM_NAME, {})
             url = debian_downloads.get(arch_label)
             if url:
-                packages.append(DebPackage(version, arch_label, debian_arch, url))
-                break
-        else:
+                checksum = (
+                    item.get("checksums", {}).get(DEBIAN_SYSTEM_NAME, {}).get(arch_label)
+                )
+                packages.append(
+                    DebPackage(
+                        version,
+                        arch_label,
+                        debian_arch,
+                        url,
+                        checksum if is_sha256(checksum) else None,
+                    )
+                )
+                selected += 1
+
+        if not selected:
             raise ValueError(f"No Debian/Ubuntu package found for {arch_label}")
 
     return packages
 
 
-def download_file(url: str, destination: Path) -> None:
-    destination.parent.mkdir(parents=True, exist_ok=True)
-    temporary = destination.with_suffix(destination.suffix + ".part")
-
-    with requests.get(url, stream=True, timeout=60) as response:
-        response.raise_for_status()
-        with temporary.open("wb") as output:
-            for chunk in response.iter_content(chunk_size=1024 * 1024):
-                if chunk:
-                    output.write(chunk)
+def is_sha256(value: Any) -> bool:
+    return (
+        isinstance(value, str)
+        and len(value) == 64
+        and all(c in "0123456789abcdef" for c in value.lower())
+    )
 
-    os.replace(temporary, destination)
 
+class MultiHash:
+    """Feed each chunk of data into several hashlib digests at once."""
 
-def package_field(stanza: str, field_name: str) -> str | None:
-    prefix = f"{field_name}:"
-    for line in stanza.splitlines():
-        if line.startswith(prefix):
-            return line[len(prefix) :].strip()
-    return None
+    def __init__(self, algorithms: tuple[str, ...] = RELEASE_ALGORITHMS) -> None:
+        self._digests = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
 
+    def update(self, data: bytes) -> None:
+        for digest in self._digests.values():
+            digest.update(data)
 
-def filter_packages_by_arch(packages_text: str, arch: str) -> str:
-    stanzas = [stanza.strip() for stanza in packages_text.split("\n\n") if stanza.strip()]
-    matching_stanzas = [
-        stanza
-        for stanza in stanzas
-        if package_field(stanza, "Architecture") in {arch, "all"}
-    ]
+    def hexdigests(self) -> dict[str, str]:
+        return {
+            algorithm: digest.hexdigest() for algorithm, digest in self._digests.items()
+        }
 
-    if not matching_stanzas:
-        raise ValueError(f"No packages found for architecture {arch}")
 
-    return "\n\n".join(matching_stanzas) + "\n"
+@dataclass(frozen=True)
+class FileDigests:
+    size: int
+    hashes: dict[str, str]
+
+    @classmethod
+    def of_bytes(cls, data: bytes) -> FileDigests:
+        hasher = MultiHash()
+        hasher.update(data)
+        return cls(len(data), hasher.hexdigests())
+
+
+def hash_file_multi(path: Path) -> FileDigests:
+    """Compute every Release digest of `path` in a single buffered read."""
+    hasher = MultiHash()
+    size = 0
+    buffer = bytearray(DOWNLOAD_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with path.open("rb", buffering=0) as input_file:
+        while read := input_file.readinto(buffer):
+            hasher.update(view[:read])
+            size += read
+    return FileDigests(size, hasher.hexdigests())
+
+
+def hash_prefix(path: Path, digest: Any) -> int:
+    """Feed the current contents of `path` into `digest` and return its size."""
+    size = 0
+    with path.open("rb") as input_file:
+        for chunk in iter(lambda: input_file.read(DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return size
+
+
+def stream_range(
+    url: str,
+    path: Path,
+    start: int = 0,
+    end: int | None = None,
+    digest: Any = None,
+) -> Any:
+    """Append bytes `start`..`end` (inclusive) of `url` to `path`, resuming.
+
+    Whatever `path` already holds is treated as the beginning of the range,
+    so an interrupted transfer continues with an HTTP Range request instead
+    of starting over. When given, `digest` must already cover the existing
+    contents of `path` and is updated while streaming.
+
+    Returns:
+        The digest covering the whole of `path`. It is a fresh MultiHash when
+        a server ignored the Range request and the file was restarted.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+        offset = start + (path.stat().st_size if path.exists() else 0)
+        if end is not None and offset > end:
+            if offset > end + 1:
+                with path.open("r+b") as output:
+                    output.truncate(end + 1 - start)
+            return digest
+
+        headers = {}
+        if offset or end is not None:
+            headers["Range"] = f"bytes={offset}-{'' if end is None else end}"
+
+        try:
+            with get_session().get(
+                url, headers=headers, stream=True, timeout=60
+            ) as response:
+                if response.status_code == 416 and end is None:
+                    return digest
+                response.raise_for_status()
+
+                mode = "ab"
+                if headers and response.status_code != 206:
+                    if start or end is not None:
+                        raise ValueError(f"{url} ignored a range request")
+                    mode = "wb"
+                    if digest is not None:
+                        digest = MultiHash()
+
+                with path.open(mode) as output:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        output.write(chunk)
+                        if digest is not None:
+                            digest.update(chunk)
+            return digest
+        except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+            if attempt == DOWNLOAD_ATTEMPTS:
+                raise
+            print(f"Download of {url} interrupted ({e}); resuming")
+    return digest
+
+
+def content_length(url: str) -> int | None:
+    """Return the size of `url` if the server supports byte ranges for it."""
+    response = get_session().head(url, allow_redirects=True, timeout=60)
+    response.raise_for_status()
+    if response.headers.get("Accept-Ranges", "").lower() != "bytes":
+        return None
+    try:
+        return int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
+
+
+def split_ranges(size: int, segments: int) -> list[tuple[int, int]]:
+    segments = max(1, min(segments, size // MIN_SEGMENT_SIZE))
+    step = -(-size // segments)
+    return [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+
+def download_file(
+    url: str, destination: Path, sha256: str | None = None, segments: int = 1
+) -> FileDigests:
+    """Download `url` to `destination`, hashing while streaming.
+
+    Args:
+        url: URL to download.
+        destination: Final path; data is streamed to a .part file first, and
+            a .part file left by an interrupted run is resumed.
+        sha256: Expected digest (e.g. published by the CDN), if known.
+        segments: Split large files into up to this many byte ranges that are
+            fetched in parallel.
+
+    Returns:
+        The size and MD5/SHA1/SHA256 digests of the downloaded file.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temporary = destination.with_suffix(destination.suffix + ".part")
+    digest = MultiHash()
+    resumed = hash_prefix(temporary, digest) if temporary.exists() else 0
+
+    size = content_length(url) if segments > 1 else None
+    ranges = split_ranges(size, segments) if size else []
+    if len(ranges) > 1 and resumed <= ranges[0][1]:
+        # The first range streams straight into the .part file; the others go
+        # to sidecar files that are appended (and hashed) in order afterwards.
+        sidecars = [
+            temporary.parent / f"{temporary.name}.{start}" for start, _ in ranges[1:]
+        ]
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            first = executor.submit(stream_range, url, temporary, 0, ranges[0][1], digest)
+            rest = [
+                executor.submit(stream_range, url, sidecar, start, end)
+                for sidecar, (start, end) in zip(sidecars, ranges[1:])
+            ]
+            digest = first.result()
+            for future in rest:
+                future.result()
+
+        with temporary.open("ab") as output:
+            for sidecar in sidecars:
+                with sidecar.open("rb") as input_file:
+                    for chunk in iter(lambda: input_file.read(DOWNLOAD_CHUNK_SIZE), b""):
+                        output.write(chunk)
+                        digest.update(chunk)
+                sidecar.unlink()
+    else:
+        digest = stream_range(url, temporary, digest=digest)
+
+    digests = FileDigests(temporary.stat().st_size, digest.hexdigests())
+    actual = digests.hashes["sha256"]
+    if sha256 is not None and actual != sha256.lower():
+        temporary.unlink()
+        raise ValueError(f"Checksum mismatch for {url}: expected {sha256}, got {actual}")
 
+    os.replace(temporary, destination)
+    for stale in temporary.parent.glob(f"{glob.escape(temporary.name)}.*"):
+        stale.unlink()
+    return digests
+
+
+def package_metadata(
+    cache: DownloadCache, sha256: str, downloaded: FileDigests | None = None
+) -> dict[str, Any]:
+    """Return the control fields, size and digests of a cached package.
+
+    The result is stored next to the cached object, so a package is opened
+    (and only its control member read) once, right after it is downloaded.
+    `downloaded` carries the digests computed while streaming; without it
+    an older cache entry is hashed once to backfill its metadata.
+    """
+    metadata = cache.load_metadata(sha256)
+    if metadata is None:
+        path = cache.object_path(sha256)
+        digests = downloaded or hash_file_multi(path)
+        metadata = {
+            "size": digests.size,
+            "hashes": digests.hashes,
+            "control": parse_control(read_control(path)),
+        }
+        cache.save_metadata(sha256, metadata)
+    return metadata
+
+
+def build_packages_indices(
+    entries: list[tuple[DebPackage, dict[str, Any]]], architectures: list[str]
+) -> dict[str, str]:
+    """Build the Packages text of every architecture in one pass over `entries`.
+
+    Packages with `Architecture: all` are listed under every architecture.
+    """
+    stanzas: dict[str, list[str]] = {arch: [] for arch in architectures}
+    for package, metadata in sorted(
+        entries, key=lambda entry: (entry[1]["control"]["Package"], entry[0].version)
+    ):
+        control = metadata["control"]
+        stanza = packages_stanza(
+            control,
+            f"{POOL_PATH}/{package.filename}",
+            metadata["size"],
+            metadata["hashes"],
+        )
+        arch = control.get("Architecture", package.debian_arch)
+        for target in architectures if arch == "all" else [arch]:
+            if target in stanzas:
+                stanzas[target].append(stanza)
 
-def scan_packages(repo_dir: Path) -> str:
-    result = subprocess.run(
-        ["dpkg-scanpackages", "--multiversion", "pool"],
-        cwd=repo_dir,
-        check=True,
-        stdout=subprocess.PIPE,
-        text=True,
-    )
-    return result.stdout
+    for arch, arch_stanzas in stanzas.items():
+        if not arch_stanzas:
+            raise ValueError(f"No packages found for architecture {arch}")
+    return {arch: "\n".join(arch_stanzas) for arch, arch_stanzas in stanzas.items()}
 
 
 def write_packages_index(
     repo_dir: Path, suite: str, component: str, arch: str, packages_text: str
-) -> None:
-    index_dir = repo_dir / "dists" / suite / component / f"binary-{arch}"
-    index_dir.mkdir(parents=True, exist_ok=True)
-    packages_file = index_dir / "Packages"
+) -> dict[str, FileDigests]:
+    """Write Packages and Packages.gz for `arch` from its stanzas.
 
-    packages_file.write_text(
-        filter_packages_by_arch(packages_text, arch),
-        encoding="utf-8",
-    )
+    Both files are built in memory and hashed before they are written, so
+    the Release file can list them without reading them back.
 
-    with packages_file.open("rb") as raw_input:
-        with (index_dir / "Packages.gz").open("wb") as raw_output:
-            with gzip.GzipFile(
-                filename="Packages",
-                mode="wb",
-                fileobj=raw_output,
-                mtime=0,
-            ) as compressed_output:
-                shutil.copyfileobj(raw_input, compressed_output)
+    Returns:
+        Digests keyed by path relative to the suite's dists directory.
+    """
+    relative_dir = f"{component}/binary-{arch}"
+    index_dir = repo_dir / "dists" / suite / relative_dir
+    index_dir.mkdir(parents=True, exist_ok=True)
 
-
-def hash_file(path: Path, algorithm: str) -> str:
-    digest = hashlib.new(algorithm)
-    with path.open("rb") as input_file:
-        for chunk in iter(lambda: input_file.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+    packages = packages_text.encode("utf-8")
+    buffer = io.BytesIO()
+    with gzip.GzipFile(
+        filename="Packages",
+        mode="wb",
+        fileobj=buffer,
+        mtime=0,
+    ) as compressed_output:
+        compressed_output.write(packages)
+
+    written: dict[str, FileDigests] = {}
+    by_hash_dir = index_dir / "by-hash" / "SHA256"
+    by_hash_dir.mkdir(parents=True, exist_ok=True)
+    for name, data in (("Packages", packages), ("Packages.gz", buffer.getvalue())):
+        digests = FileDigests.of_bytes(data)
+        write_if_changed(index_dir / name, data)
+        write_if_changed(by_hash_dir / digests.hashes["sha256"], data)
+        written[f"{relative_dir}/{name}"] = digests
+    return written
+
+
+def prune_by_hash(index_dir: Path, generations: list[list[str]]) -> None:
+    """Delete by-hash copies that belong to none of the retained generations."""
+    by_hash_dir = index_dir / "by-hash" / "SHA256"
+    retained = {digest for generation in generations for digest in generation}
+    if by_hash_dir.is_dir():
+        for path in by_hash_dir.iterdir():
+            if path.name not in retained:
+                path.unlink()
 
 
 def release_entries(release_dir: Path) -> list[Path]:
@@ -172,7 +461,9 @@ def release_entries(release_dir: Path) -> list[Path]:
     return sorted(
         path
         for path in release_dir.rglob("*")
-        if path.is_file() and path.name not in ignored
+        if path.is_file()
+        and path.name not in ignored
+        and "by-hash" not in path.relative_to(release_dir).parts
     )
 
 
@@ -183,43 +474,66 @@ def write_release_file(
     architectures: list[str],
     origin: str,
     label: str,
-) -> None:
+    known_digests: dict[str, FileDigests] | None = None,
+    previous_fingerprint: str | None = None,
+) -> tuple[str, bool]:
+    """Write the suite's Release file unless only its Date would change.
+
+    Files listed in `known_digests` (keyed by path relative to the suite
+    directory) are not read again; any other file is hashed once for all
+    algorithms.
+
+    Returns:
+        The fingerprint of the Release content without its Date field, and
+        whether the file was (re)written. It is left alone when the
+        fingerprint equals `previous_fingerprint`.
+    """
     release_dir = repo_dir / "dists" / suite
     release_dir.mkdir(parents=True, exist_ok=True)
+    known_digests = known_digests or {}
 
     lines = [
         f"Origin: {origin}",
         f"Label: {label}",
         f"Suite: {suite}",
         f"Codename: {suite}",
-        f"Date: {datetime.now(timezone.utc).strftime('%a, %d %b %Y %H:%M:%S %z')}",
+        "Acquire-By-Hash: yes",
         f"Architectures: {' '.join(architectures)}",
         f"Components: {component}",
         "Description: Positron daily builds for Debian and Ubuntu",
     ]
 
-    files = release_entries(release_dir)
-    for field_name, algorithm in (
-        ("MD5Sum", "md5"),
-        ("SHA1", "sha1"),
-        ("SHA256", "sha256"),
-    ):
+    entries: list[tuple[str, FileDigests]] = []
+    for path in release_entries(release_dir):
+        relative = path.relative_to(release_dir).as_posix()
+        digests = known_digests.get(relative)
+        entries.append((relative, digests or hash_file_multi(path)))
+
+    for field_name, algorithm in zip(RELEASE_FIELDS, RELEASE_ALGORITHMS):
         lines.append(f"{field_name}:")
-        for path in files:
-            relative = path.relative_to(release_dir).as_posix()
-            lines.append(
-                f" {hash_file(path, algorithm)} {path.stat().st_size:16d} {relative}"
-            )
+        for relative, digests in entries:
+            lines.append(f" {digests.hashes[algorithm]} {digests.size:16d} {relative}")
+
+    release_file = release_dir / "Release"
+    fingerprint = hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+    if fingerprint == previous_fingerprint and release_file.exists():
+        return fingerprint, False
 
-    (release_dir / "Release").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    lines.insert(
+        4, f"Date: {datetime.now(timezone.utc).strftime('%a, %d %b %Y %H:%M:%S %z')}"
+    )
+    release_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return fingerprint, True
 
 
 def sign_release_file(repo_dir: Path, suite: str, signing_key: str | None) -> None:
+    release_dir = repo_dir / "dists" / suite
     if not signing_key:
         print("No signing key configured; APT repository will be unsigned.")
+        for signature in ("InRelease", "Release.gpg"):
+            (release_dir / signature).unlink(missing_ok=True)
         return
 
-    release_dir = repo_dir / "dists" / suite
     release_file = release_dir / "Release"
 
     subprocess.run(
@@ -253,18 +567,18 @@ def sign_release_file(repo_dir: Path, suite: str, signing_key: str | None) -> No
     )
 
 
-def copy_public_key(public_key: Path, repo_dir: Path, required: bool) -> None:
+def copy_public_key(public_key: Path, repo_dir: Path, required: bool) -> bool:
     if not public_key.exists():
         message = f"Public key file not found: {public_key}"
         if required:
             raise FileNotFoundError(message)
         print(message)
-        return
+        return False
 
-    shutil.copyfile(public_key, repo_dir / PUBLIC_KEY_FILE)
+    return write_if_changed(repo_dir / PUBLIC_KEY_FILE, public_key.read_bytes())
 
 
-def write_site_index(output_dir: Path, base_url: str, suite: str, component: str) -> None:
+def write_site_index(output_dir: Path, base_url: str, suite: str, component: str) -> bool:
     repo_url = base_url.rstrip("/") or "https://OWNER.github.io/REPOSITORY/apt"
     html = f"""<!doctype html>
 <html lang="en">
@@ -290,43 +604,231 @@ sudo apt install positron</code></pre>
 </body>
 </html>
 """
-    (output_dir / "index.html").write_text(html, encoding="utf-8")
-
-
-def build_repo(args: argparse.Namespace) -> None:
-    packages = select_latest_debs(load_versions(args.data))
+    return write_if_changed(output_dir / "index.html", html.encode("utf-8"))
+
+
+def load_repo_state(path: Path) -> dict[str, Any]:
+    try:
+        with path.open("r", encoding="utf-8") as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_repo_state(path: Path, state: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".part")
+    with temporary.open("w", encoding="utf-8") as state_file:
+        json.dump(state, state_file, indent=1, sort_keys=True)
+    os.replace(temporary, path)
+
+
+def sync_pool(
+    pool_dir: Path,
+    cache: DownloadCache,
+    desired: dict[str, dict[str, str]],
+    previous: dict[str, dict[str, str]],
+) -> set[str]:
+    """Link new or changed packages into the pool and drop removed ones.
+
+    Returns:
+        The architectures whose package set changed.
+    """
+    changed: set[str] = set()
+    for filename, entry in desired.items():
+        destination = pool_dir / filename
+        if previous.get(filename) == entry and destination.exists():
+            continue
+        link_or_copy(cache.object_path(entry["sha256"]), destination)
+        changed.add(entry["architecture"])
+        print(f"Added {filename} to the pool")
+
+    for filename, entry in previous.items():
+        if filename not in desired:
+            (pool_dir / filename).unlink(missing_ok=True)
+            changed.add(entry["architecture"])
+            print(f"Removed {filename} from the pool")
+    return changed
+
+
+def build_repo(args: argparse.Namespace) -> bool:
+    """Bring the APT repository in `args.output` up to date.
+
+    The state of the previous run (pool contents, index digests, retained
+    by-hash generations and the Release fingerprint) is kept next to the
+    output directory. Only pool
+    entries that changed are linked or removed, only the binary-<arch>
+    indices they affect are rewritten, and Release is rewritten and re-signed
+    only when something other than its Date changed.
+
+    Returns:
+        True if anything in the output directory changed.
+    """
+    packages = select_latest_debs(load_versions(args.data), max(1, args.keep))
     output_dir = args.output.resolve()
     repo_dir = output_dir / args.repo_path
+    dists_dir = repo_dir / "dists" / args.suite
+    state_path = args.state or output_dir.with_name(output_dir.name + ".state.json")
+    layout = {
+        "repo_path": args.repo_path,
+        "suite": args.suite,
+        "component": args.component,
+    }
+
+    state = load_repo_state(state_path)
+    if state.get("layout") != layout or not repo_dir.is_dir():
+        if output_dir.exists():
+            shutil.rmtree(output_dir)
+        state = {}
+
+    cache = DownloadCache(args.cache_dir, args.cache_max_bytes)
+
+    def fetch(package: DebPackage) -> tuple[str, dict[str, Any]]:
+        downloaded: FileDigests | None = None
+
+        def download(url: str, destination: Path, sha256: str | None) -> str:
+            nonlocal downloaded
+            downloaded = download_file(
+                url, destination, sha256, segments=args.download_segments
+            )
+            return downloaded.hashes["sha256"]
 
-    if output_dir.exists():
-        shutil.rmtree(output_dir)
+        cached = cache.get(package.url, package.sha256)
+        if cached is None:
+            print(f"Downloading {package.url}")
+            cached = cache.fetch(package.url, package.sha256, download)
+        else:
+            print(f"Using cached {package.filename}")
+        return cached, package_metadata(cache, cached, downloaded)
 
-    pool_dir = repo_dir / "pool" / "main" / "p" / "positron"
-    for package in packages:
-        destination = pool_dir / package.filename
-        print(f"Downloading {package.url}")
-        download_file(package.url, destination)
+    with ThreadPoolExecutor(max_workers=max(1, args.download_workers)) as executor:
+        fetched = list(executor.map(fetch, packages))
+    freed = cache.evict(keep={digest for digest, _ in fetched})
+    if freed:
+        print(f"Evicted {freed / 1024**2:.1f} MiB from the download cache")
 
+    entries = [(package, metadata) for package, (_, metadata) in zip(packages, fetched)]
     architectures = sorted({package.debian_arch for package in packages})
-    packages_text = scan_packages(repo_dir)
-    for architecture in architectures:
-        write_packages_index(
-            repo_dir, args.suite, args.component, architecture, packages_text
+    desired_pool = {
+        package.filename: {
+            "sha256": digest,
+            "architecture": metadata["control"].get("Architecture", package.debian_arch),
+        }
+        for package, (digest, metadata) in zip(packages, fetched)
+    }
+    changed_architectures = sync_pool(
+        repo_dir / POOL_PATH, cache, desired_pool, state.get("pool", {})
+    )
+    if "all" in changed_architectures:
+        changed_architectures.update(architectures)
+
+    previous_indices = state.get("indices", {})
+    by_hash = {
+        architecture: generations
+        for architecture, generations in state.get("by_hash", {}).items()
+        if architecture in architectures
+    }
+    for architecture in previous_indices.keys() - set(architectures):
+        shutil.rmtree(
+            dists_dir / args.component / f"binary-{architecture}", ignore_errors=True
         )
+    affected = [
+        architecture
+        for architecture in architectures
+        if architecture in changed_architectures
+        or architecture not in previous_indices
+        or architecture not in by_hash
+        or not all(
+            (dists_dir / relative).exists() for relative in previous_indices[architecture]
+        )
+    ]
+
+    index_digests: dict[str, dict[str, FileDigests]] = {
+        architecture: {
+            relative: FileDigests(**digests)
+            for relative, digests in previous_indices[architecture].items()
+        }
+        for architecture in architectures
+        if architecture not in affected
+    }
+    if affected:
+        indices = build_packages_indices(
+            [
+                entry
+                for entry in entries
+                if desired_pool[entry[0].filename]["architecture"] in {*affected, "all"}
+            ],
+            affected,
+        )
+        for architecture in affected:
+            print(f"Writing Packages index for {architecture}")
+            index_digests[architecture] = write_packages_index(
+                repo_dir, args.suite, args.component, architecture, indices[architecture]
+            )
+            generation = sorted(
+                digests.hashes["sha256"]
+                for digests in index_digests[architecture].values()
+            )
+            previous = [
+                kept for kept in by_hash.get(architecture, []) if kept != generation
+            ]
+            by_hash[architecture] = [generation, *previous][:BY_HASH_GENERATIONS]
+            prune_by_hash(
+                dists_dir / args.component / f"binary-{architecture}",
+                by_hash[architecture],
+            )
 
-    write_release_file(
+    fingerprint, release_changed = write_release_file(
         repo_dir,
         args.suite,
         args.component,
         architectures,
         args.origin,
         args.label,
+        {
+            relative: digests
+            for arch_digests in index_digests.values()
+            for relative, digests in arch_digests.items()
+        },
+        state.get("release"),
     )
-    sign_release_file(repo_dir, args.suite, args.signing_key)
-    copy_public_key(args.public_key, repo_dir, required=bool(args.signing_key))
-    write_site_index(output_dir, args.base_url, args.suite, args.component)
+    resign = (
+        release_changed
+        or state.get("signed_by") != args.signing_key
+        or (args.signing_key and not (dists_dir / "InRelease").exists())
+    )
+    if resign:
+        sign_release_file(repo_dir, args.suite, args.signing_key)
 
-    print(f"APT repository written to {repo_dir}")
+    key_changed = copy_public_key(
+        args.public_key, repo_dir, required=bool(args.signing_key)
+    )
+    site_changed = write_site_index(output_dir, args.base_url, args.suite, args.component)
+    print_stats(precompress_all([output_dir / "index.html"]), "Site pages")
+
+    save_repo_state(
+        state_path,
+        {
+            "layout": layout,
+            "pool": desired_pool,
+            "indices": {
+                architecture: {
+                    relative: asdict(digests) for relative, digests in arch_digests.items()
+                }
+                for architecture, arch_digests in index_digests.items()
+            },
+            "by_hash": by_hash,
+            "release": fingerprint,
+            "signed_by": args.signing_key,
+        },
+    )
+
+    changed = bool(
+        changed_architectures or affected or resign or key_changed or site_changed
+    )
+    report_output_status(changed)
+    print(f"APT repository {'updated' if changed else 'unchanged'} at {repo_dir}")
+    return changed
 
 
 def main() -> int:
@@ -0,0 +1,93 @@
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import brotli  # optional: install the "compress" extra for .br siblings
+except ImportError:
+    brotli = None
+
+
+# Suffixes of the precompressed siblings `precompress` writes next to a file
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+
+@dataclass(frozen=True)
+class ArtifactStats:
+    path: Path
+    raw: int
+    gzip: int
+    brotli: int | None
+
+
+def minify_json(source: Path, destination: Path) -> bool:
+    """Write a minified copy of a JSON file.
+
+    Returns:
+        True if `destination` was (re)written.
+    """
+    with source.open("r", encoding="utf-8") as json_file:
+        data = json.load(json_file)
+    return write_if_changed(
+        destination, json.dumps(data, separators=(",", ":")).encode("utf-8")
+    )
+
+
+def write_if_changed(path: Path, content: bytes) -> bool:
+    if path.exists() and path.read_bytes() == content:
+        return False
+    temporary = path.with_name(path.name + ".part")
+    temporary.write_bytes(content)
+    os.replace(temporary, path)
+    return True
+
+
+def precompress(path: Path) -> ArtifactStats:
+    """Write deterministic .gz (and, if available, .br) siblings of `path`.
+
+    gzip output uses a fixed mtime and no embedded filename, and brotli is
+    deterministic, so unchanged inputs produce byte-identical siblings.
+    """
+    data = path.read_bytes()
+
+    gzipped = gzip.compress(data, compresslevel=9, mtime=0)
+    write_if_changed(path.with_name(path.name + ".gz"), gzipped)
+
+    brotli_size = None
+    if brotli is not None:
+        compressed = brotli.compress(data, quality=11)
+        write_if_changed(path.with_name(path.name + ".br"), compressed)
+        brotli_size = len(compressed)
+
+    return ArtifactStats(path, len(data), len(gzipped), brotli_size)
+
+
+def precompress_all(paths: list[Path]) -> list[ArtifactStats]:
+    return [precompress(path) for path in paths if path.is_file()]
+
+
+def print_stats(stats: list[ArtifactStats], label: str, detailed: bool = True) -> None:
+    """Print per-artifact (if `detailed`) and total transfer sizes."""
+    if not stats:
+        return
+
+    def percent(size: int, raw: int) -> str:
+        return f"{100 * size / raw:.0f}%" if raw else "-"
+
+    for item in stats if detailed else []:
+        line = f"  {item.path}: {item.raw} B, gzip {item.gzip} B ({percent(item.gzip, item.raw)})"
+        if item.brotli is not None:
+            line += f", brotli {item.brotli} B ({percent(item.brotli, item.raw)})"
+        print(line)
+
+    raw = sum(item.raw for item in stats)
+    gzipped = sum(item.gzip for item in stats)
+    line = f"{label}: {len(stats)} file(s), {raw} B raw, gzip {gzipped} B ({percent(gzipped, raw)})"
+    if brotli is not None:
+        brotlied = sum(item.brotli or 0 for item in stats)
+        line += f", brotli {brotlied} B ({percent(brotlied, raw)})"
+    else:
+        line += " (brotli not installed; .br skipped)"
+    print(line)
@@ -4,8 +4,46 @@ from pathlib import Path
 OWNER = "posit-dev"
 REPO = "positron"
 TOKEN = os.environ.get("GITHUB_TOKEN")  # optional, higher rate limit if set
+GITHUB_API_URL: str = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+# Where tags come from: "rest" (paginated tags endpoint) or "graphql" (needs a token)
+TAG_SOURCE: str = os.getenv("TAG_SOURCE", "rest").lower()
 
 # SCAN_WINDOW can still be controlled by env if desired (0 = no network checks)
 SCAN_WINDOW: int = max(0, int(os.getenv("SCAN_WINDOW", "50")))
-MAX_HISTORY_ROWS: int = 30
+# Size of the "hot" window kept in data/dailies.csv and rendered in the README
+MAX_HISTORY_ROWS: int = max(1, int(os.getenv("MAX_HISTORY_ROWS", "30")))
 CSV_PATH: Path = Path("data/dailies.csv")
+# History backend: "csv" (data/dailies.csv) or "sqlite" (data/dailies.sqlite, WAL mode)
+STATE_BACKEND: str = os.getenv("STATE_BACKEND", "csv").lower()
+SQLITE_PATH: Path = Path("data/dailies.sqlite")
+HISTORY_PATH: Path = SQLITE_PATH if STATE_BACKEND == "sqlite" else CSV_PATH
+# Append-only archive of every daily ever seen
+ARCHIVE_PATH: Path = Path("data/archive.jsonl")
+# Sharded JSON API (latest.json, latest/<system>/<arch>.json, versions/<version>.json)
+API_DIR: Path = Path("api")
+
+# Concurrency for checksum probes against the CDN
+PROBE_WORKERS: int = max(1, int(os.getenv("PROBE_WORKERS", "8")))
+PROBE_HOST_LIMIT: int = max(1, int(os.getenv("PROBE_HOST_LIMIT", "4")))
+
+# Shared HTTP client (connection pool, retries and default timeout)
+HTTP_POOL_SIZE: int = max(1, int(os.getenv("HTTP_POOL_SIZE", "10")))
+HTTP_RETRIES: int = max(0, int(os.getenv("HTTP_RETRIES", "3")))
+HTTP_BACKOFF: float = max(0.0, float(os.getenv("HTTP_BACKOFF", "0.5")))
+HTTP_TIMEOUT: float = max(1.0, float(os.getenv("HTTP_TIMEOUT", "30")))
+
+# Local cache directory (persisted between scheduled runs by the workflow)
+CACHE_DIR: Path = Path(os.getenv("CACHE_DIR", ".cache"))
+HTTP_CACHE_DIR: Path = CACHE_DIR / "http"
+# Derived lookup index of the archive; rebuilt whenever missing or stale
+ARCHIVE_INDEX_PATH: Path = CACHE_DIR / "archive.idx.json"
+
+# Per-version probe state with exponential backoff for unpublished/partial builds
+PROBE_STATE_PATH: Path = CACHE_DIR / "probe_state.json"
+PROBE_BACKOFF_BASE_HOURS: float = max(0.0, float(os.getenv("PROBE_BACKOFF_BASE_HOURS", "6")))
+PROBE_BACKOFF_MAX_HOURS: float = max(0.0, float(os.getenv("PROBE_BACKOFF_MAX_HOURS", "336")))
+PROBE_PARTIAL_MAX_HOURS: float = max(0.0, float(os.getenv("PROBE_PARTIAL_MAX_HOURS", "24")))
+
+# Content-addressed cache of downloaded .deb packages for the APT repository
+APT_CACHE_DIR: Path = CACHE_DIR / "apt-downloads"
+APT_CACHE_MAX_BYTES: int = max(0, int(os.getenv("APT_CACHE_MAX_BYTES", str(2 * 1024**3))))
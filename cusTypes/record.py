@@ -1,31 +1,74 @@
 from functools import total_ordering
 from typing import TypedDict
-from platforms import Platform
+from platforms import (
+    Platform,
+    PLATFORM_BITS,
+    ALL_PLATFORMS_MASK,
+    platforms_to_mask,
+    mask_to_platforms,
+)
 from .version import Version
 
 
 class DailyRecord(TypedDict):
     version: Version
     fetched_at: str
+    platforms: int  # bitmask of available platforms, see platforms.PLATFORM_BITS
+    checksums: dict[Platform, str]  # published digests of the available platforms
+
+
+class ProbeState(TypedDict):
+    version: Version
+    last_probed: str
+    status: int | None  # HTTP status of the checksums request, None on network error
+    platforms_found: list[str]  # Platform member names present in the checksums
+    next_eligible: str
+    attempts: int
 
 
 @total_ordering
 class DailyAvailability:
+    """Availability of one version, stored as an integer platform bitmask.
+
+    Masks are trusted as-is; mappings from untrusted sources are validated
+    once, at the boundary, by `from_platforms`.
+    """
+
+    __slots__ = ("version", "platforms", "checksums")
+
     version: Version
-    available_platforms: dict[Platform, bool]
+    platforms: int  # bitmask of available platforms, see platforms.PLATFORM_BITS
+    checksums: dict[Platform, str]
 
     def __init__(
-        self, version: Version, available_platforms: dict[Platform, bool]
+        self,
+        version: Version,
+        platforms: int,
+        checksums: dict[Platform, str] | None = None,
     ) -> None:
+        if not 0 <= platforms <= ALL_PLATFORMS_MASK:
+            raise ValueError(f"Invalid platform bitmask: {platforms:#x}")
         self.version = version
-        self.available_platforms = available_platforms
-        self._validate_platforms()
+        self.platforms = platforms
+        self.checksums = checksums or {}
 
-    def _validate_platforms(self) -> None:
+    @classmethod
+    def from_platforms(
+        cls,
+        version: Version,
+        available_platforms: dict[Platform, bool],
+        checksums: dict[Platform, str] | None = None,
+    ) -> "DailyAvailability":
+        """Build from a full {Platform: bool} mapping, validating it first."""
+        cls._validate_platforms(available_platforms)
+        return cls(version, platforms_to_mask(available_platforms), checksums)
+
+    @staticmethod
+    def _validate_platforms(available_platforms: dict[Platform, bool]) -> None:
         """Verify that available_platforms contains all elements of the Platform enum."""
         # Get all platform enum members
         all_platforms = set(Platform)
-        provided_platforms = set(self.available_platforms.keys())
+        provided_platforms = set(available_platforms.keys())
 
         missing_platforms = all_platforms - provided_platforms
         extra_platforms = provided_platforms - all_platforms
@@ -43,12 +86,28 @@ class DailyAvailability:
             )
 
         # Also verify all values are booleans
-        for platform, is_available in self.available_platforms.items():
+        for platform, is_available in available_platforms.items():
             if not isinstance(is_available, bool):
                 raise TypeError(
                     f"Value for platform {platform} must be bool, got {type(is_available).__name__}"
                 )
 
+    def is_available(self, platform: Platform) -> bool:
+        return bool(self.platforms & PLATFORM_BITS[platform])
+
+    @property
+    def available_count(self) -> int:
+        return self.platforms.bit_count()
+
+    @property
+    def is_complete(self) -> bool:
+        return self.platforms == ALL_PLATFORMS_MASK
+
+    @property
+    def available_platforms(self) -> dict[Platform, bool]:
+        """The availability as a full {Platform: bool} mapping (built on demand)."""
+        return mask_to_platforms(self.platforms)
+
     def __eq__(self, other) -> bool:
         if not isinstance(other, DailyAvailability):
             return NotImplemented
@@ -1,13 +1,24 @@
 from __future__ import annotations
-from functools import total_ordering
+from functools import lru_cache, total_ordering
+from typing import Iterable
 import re
 
+VERSION_RE = re.compile(r"(\d{4})\.(\d{1,2})\.(\d{1})-(\d+)")
+# Upper bound on the number of distinct strings kept by the intern cache
+INTERN_CACHE_SIZE = 4096
+
 @total_ordering
 class Version:
+    """An immutable daily version with a precomputed sort key and hash."""
+
+    __slots__ = ("year", "month", "type", "number", "_key", "_hash")
+
     year: int
     month: int
     type: int # 0 = beta, 1 = release
     number: int
+    _key: tuple[int, int, int, int]
+    _hash: int
 
     def __init__(self, year: int | str, month: int | str, type: int | str, number: int | str) -> None:
         """
@@ -20,24 +31,54 @@ class Version:
             raise TypeError("Version expects four values: year, month, type, number")
 
         try:
-            self.year = int(year)
-            self.month = int(month)
-            self.type = int(type)
-            self.number = int(number)
+            key = (int(year), int(month), int(type), int(number))
         except Exception as exc:
             raise ValueError(
                 "year, month, type and number must be integers or numeric strings"
             ) from exc
 
+        setattr_ = object.__setattr__
+        setattr_(self, "year", key[0])
+        setattr_(self, "month", key[1])
+        setattr_(self, "type", key[2])
+        setattr_(self, "number", key[3])
+        setattr_(self, "_key", key)
+        setattr_(self, "_hash", hash(key))
+
         self._validate()
 
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError(f"Version is immutable (cannot set {name!r})")
+
+    def __delattr__(self, name) -> None:
+        raise AttributeError(f"Version is immutable (cannot delete {name!r})")
+
+    def __reduce__(self):
+        return (Version, self._key)
+
     @classmethod
     def from_string(cls, s: str) -> Version:
-        RE = re.compile(r"^(\d{4})\.(\d{1,2})\.(\d{1})-(\d+)$")
-        m = RE.fullmatch(s.strip())
-        if not m:
+        """Parse a daily version string, returning a shared (interned) instance."""
+        version = _intern(s.strip())
+        if version is None:
             raise ValueError(f"invalid version string: {s!r}")
-        return Version(m.group(1), m.group(2), m.group(3), m.group(4))
+        return version
+
+    @classmethod
+    def parse_many(cls, strings: Iterable[str]) -> list[Version]:
+        """Parse many strings, silently skipping anything that is not a daily version.
+
+        Strings that cannot start a version (e.g. "v1.0" tags) are rejected
+        before the regex or the intern cache are consulted.
+        """
+        versions: list[Version] = []
+        for s in strings:
+            if not s[:1].isdigit():
+                continue
+            version = _intern(s)
+            if version is not None:
+                versions.append(version)
+        return versions
 
     def _validate(self):
         if not (1 <= self.month <= 12):
@@ -56,29 +97,32 @@ class Version:
         return f"Version(year={self.year}, month={self.month}, type={self.type}, number={self.number})"
 
     def __eq__(self, other) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Version):
             return NotImplemented
-        return (self.year, self.month, self.type, self.number) == (
-            other.year,
-            other.month,
-            other.type,
-            other.number,
-        )
+        return self._key == other._key
 
     def __lt__(self, other) -> bool:
         if not isinstance(other, Version):
             return NotImplemented
-        return (self.year, self.month, self.type, self.number) < (
-            other.year,
-            other.month,
-            other.type,
-            other.number,
-        )
+        return self._key < other._key
 
     def __hash__(self) -> int:
         """Return a hash consistent with equality.
 
-        Uses the tuple of (year, month, type, number) so Version objects
-        can be used as dict keys and in sets.
+        Precomputed from the tuple of (year, month, type, number) so Version
+        objects can be used as dict keys and in sets.
         """
-        return hash((self.year, self.month, self.type, self.number))
\ No newline at end of file
+        return self._hash
+
+@lru_cache(maxsize=INTERN_CACHE_SIZE)
+def _intern(s: str) -> Version | None:
+    """Parse `s` once and share the result; None if it is not a valid version."""
+    m = VERSION_RE.fullmatch(s)
+    if not m:
+        return None
+    try:
+        return Version(m.group(1), m.group(2), m.group(3), m.group(4))
+    except ValueError:
+        return None
@@ -0,0 +1,143 @@
+import gzip
+import io
+import lzma
+import tarfile
+from pathlib import Path
+
+try:
+    from compression import zstd  # Python 3.14+; used by zstd-compressed .debs
+except ImportError:
+    zstd = None
+
+
+AR_MAGIC = b"!<arch>\n"
+AR_HEADER_SIZE = 60
+
+# Field order used by dpkg-scanpackages; fields not listed keep their control
+# file order after the known ones.
+PACKAGES_FIELD_ORDER = (
+    "Package",
+    "Package-Type",
+    "Source",
+    "Version",
+    "Built-Using",
+    "Static-Built-Using",
+    "Architecture",
+    "Essential",
+    "Origin",
+    "Bugs",
+    "Maintainer",
+    "Installed-Size",
+    "Pre-Depends",
+    "Depends",
+    "Recommends",
+    "Suggests",
+    "Conflicts",
+    "Breaks",
+    "Enhances",
+    "Replaces",
+    "Provides",
+    "Filename",
+    "Size",
+    "MD5sum",
+    "SHA1",
+    "SHA256",
+    "Section",
+    "Priority",
+    "Homepage",
+    "Description",
+)
+
+
+def read_control_archive(path: Path) -> tuple[str, bytes]:
+    """Return the name and raw bytes of the control.tar.* member of a .deb.
+
+    Only the ar headers up to the control member are read; the (large)
+    data.tar member is never touched.
+    """
+    with path.open("rb") as deb_file:
+        if deb_file.read(len(AR_MAGIC)) != AR_MAGIC:
+            raise ValueError(f"{path} is not a Debian package (bad ar magic)")
+
+        while header := deb_file.read(AR_HEADER_SIZE):
+            if len(header) < AR_HEADER_SIZE or header[58:60] != b"`\n":
+                raise ValueError(f"{path} has a truncated or corrupt ar header")
+            name = header[:16].decode("ascii").strip().rstrip("/")
+            size = int(header[48:58].decode("ascii").strip())
+            if name.startswith("control.tar"):
+                return name, deb_file.read(size)
+            deb_file.seek(size + size % 2, io.SEEK_CUR)
+
+    raise ValueError(f"{path} has no control archive")
+
+
+def decompress_member(name: str, data: bytes) -> bytes:
+    if name == "control.tar":
+        return data
+    if name == "control.tar.gz":
+        return gzip.decompress(data)
+    if name == "control.tar.xz":
+        return lzma.decompress(data)
+    if name == "control.tar.zst":
+        if zstd is None:
+            raise ValueError("control.tar.zst requires Python 3.14 (compression.zstd)")
+        return zstd.decompress(data)
+    raise ValueError(f"Unsupported control archive compression: {name}")
+
+
+def read_control(path: Path) -> str:
+    """Return the text of the DEBIAN/control file inside a .deb."""
+    name, data = read_control_archive(path)
+    with tarfile.open(fileobj=io.BytesIO(decompress_member(name, data))) as archive:
+        for member in archive.getmembers():
+            if member.isfile() and member.name in {"control", "./control"}:
+                control = archive.extractfile(member)
+                return control.read().decode("utf-8")
+    raise ValueError(f"{path} has no control file")
+
+
+def parse_control(text: str) -> dict[str, str]:
+    """Parse a single control stanza into an ordered field -> value mapping.
+
+    Continuation lines are kept verbatim (including their leading space) so
+    multi-line fields such as Description round-trip unchanged.
+    """
+    fields: dict[str, str] = {}
+    current = None
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if line[0] in " \t" and current is not None:
+            fields[current] += "\n" + line
+            continue
+        name, _, value = line.partition(":")
+        current = name.strip()
+        fields[current] = value.strip()
+    return fields
+
+
+def packages_stanza(
+    control: dict[str, str],
+    filename: str,
+    size: int,
+    hashes: dict[str, str],
+) -> str:
+    """Build a Packages index stanza from control fields and file digests."""
+    fields = dict(control)
+    fields.update(
+        {
+            "Filename": filename,
+            "Size": str(size),
+            "MD5sum": hashes["md5"],
+            "SHA1": hashes["sha1"],
+            "SHA256": hashes["sha256"],
+        }
+    )
+    ordered = [name for name in PACKAGES_FIELD_ORDER if name in fields]
+    ordered += [name for name in fields if name not in PACKAGES_FIELD_ORDER]
+    lines = []
+    for name in ordered:
+        value = fields[name]
+        separator = "" if value.startswith("\n") else " "
+        lines.append(f"{name}:{separator}{value}\n")
+    return "".join(lines)
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Callable
+from pathlib import Path
+
+from config import APT_CACHE_DIR, APT_CACHE_MAX_BYTES
+
+
+Downloader = Callable[[str, Path, str | None], str]
+
+
+def url_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def link_or_copy(source: Path, destination: Path) -> None:
+    """Hardlink `source` to `destination`, copying when linking is not possible.
+
+    The destination is replaced atomically, so readers never see a partial file.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temporary = destination.with_suffix(destination.suffix + ".link")
+    temporary.unlink(missing_ok=True)
+    try:
+        os.link(source, temporary)
+    except OSError:
+        shutil.copyfile(source, temporary)
+    os.replace(temporary, destination)
+
+
+class DownloadCache:
+    """Content-addressed store for downloaded files.
+
+    Objects live under `objects/<sha256>` and are only ever created by
+    renaming a fully downloaded and verified file into place. When the
+    expected checksum of a URL is unknown, `urls/<sha256(url)>` records the
+    digest the URL resolved to last time, and `meta/<sha256>.json` holds any
+    metadata a caller derived from an object. An object's mtime is its last use,
+    which `evict` relies on to drop the least recently used objects once the
+    cache grows past its size budget.
+    """
+
+    def __init__(
+        self, root: Path = APT_CACHE_DIR, max_bytes: int = APT_CACHE_MAX_BYTES
+    ) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.objects_dir = root / "objects"
+        self.urls_dir = root / "urls"
+        self.meta_dir = root / "meta"
+
+    def object_path(self, sha256: str) -> Path:
+        return self.objects_dir / sha256.lower()
+
+    def metadata_path(self, sha256: str) -> Path:
+        return self.meta_dir / f"{sha256.lower()}.json"
+
+    def load_metadata(self, sha256: str) -> dict | None:
+        try:
+            with self.metadata_path(sha256).open("r", encoding="utf-8") as meta_file:
+                return json.load(meta_file)
+        except (OSError, ValueError):
+            return None
+
+    def save_metadata(self, sha256: str, metadata: dict) -> None:
+        self.meta_dir.mkdir(parents=True, exist_ok=True)
+        path = self.metadata_path(sha256)
+        temporary = path.with_suffix(".part")
+        with temporary.open("w", encoding="utf-8") as meta_file:
+            json.dump(metadata, meta_file, separators=(",", ":"))
+        os.replace(temporary, path)
+
+    def _url_path(self, url: str) -> Path:
+        return self.urls_dir / url_key(url)
+
+    def _touch(self, path: Path) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def get(self, url: str, sha256: str | None = None) -> str | None:
+        """Return the digest of a cached copy of `url`, or None on a miss."""
+        if sha256 is None:
+            try:
+                sha256 = self._url_path(url).read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+
+        path = self.object_path(sha256)
+        if not path.is_file():
+            return None
+        self._touch(path)
+        return sha256.lower()
+
+    def fetch(self, url: str, sha256: str | None, download: Downloader) -> str:
+        """Return the digest of `url`, downloading it into the cache on a miss.
+
+        Args:
+            url: URL to fetch.
+            sha256: Expected digest, if known; a mismatch is rejected by `download`.
+            download: Callable with the signature of `download_file` that
+                streams a URL to a path and returns its SHA-256 digest.
+        """
+        cached = self.get(url, sha256)
+        if cached is not None:
+            return cached
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        incoming = self.objects_dir / f"incoming-{url_key(url)}"
+        digest = download(url, incoming, sha256)
+        os.replace(incoming, self.object_path(digest))
+
+        self.urls_dir.mkdir(parents=True, exist_ok=True)
+        url_path = self._url_path(url)
+        temporary = url_path.with_suffix(".part")
+        temporary.write_text(digest + "\n", encoding="utf-8")
+        os.replace(temporary, url_path)
+        return digest
+
+    def evict(self, keep: set[str] = frozenset()) -> int:
+        """Delete least recently used objects until the cache fits its budget.
+
+        Objects whose digest is in `keep` are never deleted. Returns the
+        number of bytes freed.
+        """
+        if not self.objects_dir.is_dir():
+            return 0
+
+        entries = []
+        total = 0
+        for path in self.objects_dir.iterdir():
+            if not path.is_file() or path.name.startswith("incoming-"):
+                continue
+            stat = path.stat()
+            total += stat.st_size
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= self.max_bytes:
+                break
+            if path.name in keep:
+                continue
+            path.unlink(missing_ok=True)
+            self.metadata_path(path.name).unlink(missing_ok=True)
+            freed += size
+        return freed
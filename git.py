@@ -1,38 +1,196 @@
-import requests
-from config import OWNER, REPO, TOKEN, MAX_HISTORY_ROWS
+from typing import Iterator, Protocol
+
+from config import OWNER, REPO, TOKEN, MAX_HISTORY_ROWS, GITHUB_API_URL, TAG_SOURCE
 from cusTypes.version import Version
+from http_client import cached_get, get_session
+
+TAGS_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    refs(
+      refPrefix: "refs/tags/"
+      first: $first
+      after: $after
+      orderBy: {field: TAG_COMMIT_DATE, direction: DESC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes { name }
+    }
+  }
+}
+"""
+
+
+def github_headers() -> dict[str, str]:
+    """Return request headers for the GitHub API (auth only if a token is set)."""
+    if TOKEN:
+        return {"Authorization": f"token {TOKEN}"}
+    return {}
 
-def convert_tag_to_version(tag: dict) -> Version | None:
+
+def convert_tag_to_version(name: str) -> Version | None:
     try:
-        return Version.from_string(tag["name"])
+        return Version.from_string(name)
     except ValueError:
         return None
 
-def fetch_latest_versions(n: int = MAX_HISTORY_ROWS) -> list[Version]:
-    session = requests.Session()
-    if TOKEN:
-        session.headers.update({"Authorization": f"token {TOKEN}"})
-
-    tags = []
-    url: str | None = f"https://api.github.com/repos/{OWNER}/{REPO}/tags?per_page=100"
-    while url:
-        resp = session.get(url)
-        resp.raise_for_status()  # pyrefly: ignore
-        tags.extend(resp.json())
-        # follow Link header for pagination
-        link = resp.headers.get("Link", "")
-        url = None
-        if 'rel="next"' in link:
-            # find next URL
-            parts = [p.split(";") for p in link.split(",")]
-            for part in parts:
-                if 'rel="next"' in part[1]:
-                    url = part[0].strip().strip("<>")
-                    break
-
-    versions_raw: list[Version | None] = [convert_tag_to_version(t) for t in tags]
-    versions: list[Version] = [v for v in versions_raw if v is not None]
-    versions.sort(reverse=True)
-    versions = versions[:30]  # keep only the latest 30 versions
-
-    return versions
+
+class TagSource(Protocol):
+    """A source of tag names, yielded one page at a time.
+
+    `newest_first` declares that pages arrive in descending release order,
+    which is what allows callers to stop paging early.
+    """
+
+    newest_first: bool
+
+    def iter_pages(self) -> Iterator[list[str]]: ...
+
+
+class RestTagSource:
+    """Tags from the paginated REST endpoint (unordered, cached with ETags)."""
+
+    newest_first = False
+
+    def __init__(self, api_url: str = GITHUB_API_URL, per_page: int = 100) -> None:
+        self.api_url = api_url
+        self.per_page = per_page
+
+    def iter_pages(self) -> Iterator[list[str]]:
+        headers = github_headers()
+        url: str | None = (
+            f"{self.api_url}/repos/{OWNER}/{REPO}/tags?per_page={self.per_page}"
+        )
+        while url:
+            resp = cached_get(url, headers=headers)
+            resp.raise_for_status()  # pyrefly: ignore
+            yield [tag["name"] for tag in resp.json()]
+            # follow Link header for pagination
+            link = resp.headers.get("Link", "")
+            url = None
+            if 'rel="next"' in link:
+                # find next URL
+                parts = [p.split(";") for p in link.split(",")]
+                for part in parts:
+                    if 'rel="next"' in part[1]:
+                        url = part[0].strip().strip("<>")
+                        break
+
+
+class GraphQLTagSource:
+    """Tags from the GraphQL API, newest first (ordered by tag commit date)."""
+
+    newest_first = True
+
+    def __init__(self, api_url: str = GITHUB_API_URL, per_page: int = 100) -> None:
+        self.api_url = api_url
+        self.per_page = per_page
+
+    def iter_pages(self) -> Iterator[list[str]]:
+        after: str | None = None
+        while True:
+            resp = get_session().post(
+                f"{self.api_url}/graphql",
+                headers=github_headers(),
+                json={
+                    "query": TAGS_QUERY,
+                    "variables": {
+                        "owner": OWNER,
+                        "name": REPO,
+                        "first": self.per_page,
+                        "after": after,
+                    },
+                },
+            )
+            resp.raise_for_status()
+            payload = resp.json()
+            if payload.get("errors"):
+                raise ConnectionError(f"GraphQL error: {payload['errors']}")
+
+            refs = payload["data"]["repository"]["refs"]
+            yield [node["name"] for node in refs["nodes"]]
+            if not refs["pageInfo"]["hasNextPage"]:
+                return
+            after = refs["pageInfo"]["endCursor"]
+
+
+TAG_SOURCES: dict[str, type[RestTagSource] | type[GraphQLTagSource]] = {
+    "rest": RestTagSource,
+    "graphql": GraphQLTagSource,
+}
+
+
+def get_tag_source(name: str = TAG_SOURCE) -> TagSource:
+    """Return the configured tag source, falling back to REST when unusable."""
+    if name not in TAG_SOURCES:
+        raise ValueError(
+            f"Unknown tag source {name!r}; expected one of {sorted(TAG_SOURCES)}"
+        )
+    if name == "graphql" and not TOKEN:
+        print("GraphQL tag source requires GITHUB_TOKEN; using REST instead.")
+        name = "rest"
+    return TAG_SOURCES[name]()
+
+
+def iter_latest_versions(
+    n: int = MAX_HISTORY_ROWS,
+    floor: Version | None = None,
+    source: TagSource | None = None,
+) -> Iterator[Version]:
+    """Yield daily versions as tag pages arrive, stopping early when safe.
+
+    For sources that return tags newest first, iteration stops once `n`
+    distinct daily versions at or above `floor` have been yielded, so a
+    normal day costs one or two requests. Unordered sources (REST) are read to
+    the end, since a newer version may still be on a later page; their pages
+    are served from the ETag cache when unchanged. Without a floor nothing
+    else bounds an unordered source, so its versions are collected and only
+    the newest `n` are yielded.
+
+    Args:
+        n: Number of versions wanted.
+        floor: Oldest version of interest (e.g. the oldest row in history).
+            Older versions are skipped and do not count towards `n`.
+        source: Tag source to read from (default: configured TAG_SOURCE).
+
+    Yields:
+        Distinct versions at or above `floor`, in API order (not sorted),
+        except for an unordered source without a floor (newest first).
+    """
+    if source is None:
+        source = get_tag_source()
+    versions = _iter_distinct_versions(source, floor)
+
+    if not source.newest_first:
+        if floor is None:
+            yield from sorted(versions, reverse=True)[:n]
+        else:
+            yield from versions
+        return
+
+    for found, version in enumerate(versions, start=1):
+        yield version
+        if found >= n:
+            return
+
+
+def _iter_distinct_versions(
+    source: TagSource, floor: Version | None
+) -> Iterator[Version]:
+    seen: set[Version] = set()
+    for page in source.iter_pages():
+        for version in Version.parse_many(page):
+            if version in seen:
+                continue
+            seen.add(version)
+            if floor is None or version >= floor:
+                yield version
+
+
+def fetch_latest_versions(
+    n: int = MAX_HISTORY_ROWS,
+    floor: Version | None = None,
+    source: TagSource | None = None,
+) -> list[Version]:
+    versions = sorted(iter_latest_versions(n, floor, source), reverse=True)
+    return versions[:n]  # keep only the latest n versions
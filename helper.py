@@ -1,14 +1,28 @@
 import csv
 import json
+import os
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List
 from datetime import datetime, timezone
+from urllib.parse import urlparse
 
-from config import MAX_HISTORY_ROWS
+from config import MAX_HISTORY_ROWS, PROBE_WORKERS, PROBE_HOST_LIMIT
+from http_client import get_session
 from cusTypes.record import DailyRecord, DailyAvailability
 from cusTypes.version import Version
-from platforms import Platform, System, Architecture
+from platforms import (
+    System,
+    SYSTEM_PLATFORMS,
+    PLATFORM_BITS,
+    ALL_PLATFORMS_MASK,
+    version_links,
+    encode_checksums,
+    decode_checksums,
+)
+import sqlite_store
 
 README_TEMPLATE = """# Positron Daily Builds
 
@@ -39,43 +53,125 @@ def checksums_url(version: Version) -> str:
     return f"https://cdn.posit.co/positron/dailies/checksums/positron-{str(version)}-checksums.json"
 
 
-def fetch_checksums(version: Version) -> dict | None:
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
+
+
+def host_slot(url: str, limit: int = PROBE_HOST_LIMIT) -> threading.BoundedSemaphore:
+    """Return the semaphore bounding concurrent connections to the host of `url`."""
+    host = urlparse(url).netloc
+    with _host_slots_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = threading.BoundedSemaphore(limit)
+        return slot
+
+
+def probe_checksums(version: Version) -> tuple[int | None, dict | None]:
     """Fetch and parse the checksums JSON for a given version.
 
     Returns:
-        dict: The parsed checksums JSON if successful, None otherwise.
+        tuple: The HTTP status code (None on network errors) and the parsed
+        checksums JSON (None unless the file was fetched and parsed).
     """
     checksum_url = checksums_url(version)
     try:
-        response = requests.get(checksum_url, timeout=30)
+        with host_slot(checksum_url):
+            response = get_session().get(checksum_url)
         if response.status_code == 200:
-            return response.json()
+            return response.status_code, response.json()
         # Non-200 status codes indicate the checksums file is not available yet
-        return None
+        return response.status_code, None
     except requests.exceptions.RequestException as e:
         print(f"Network error fetching checksums for {version}: {e}")
-        return None
+        return None, None
     except ValueError as e:
         print(f"Error parsing checksums JSON for {version}: {e}")
-        return None
+        return 200, None
 
 
-def fetch_availability(version: Version) -> DailyAvailability | None:
-    checksums = fetch_checksums(version)
-    if checksums is None:
-        return None
+def fetch_checksums(version: Version) -> dict | None:
+    """Fetch and parse the checksums JSON for a given version.
 
-    # Convert checksums dictionary to platform availability dictionary
-    # Normalize: include all platforms from Platform enum, set missing to False
-    platform_availability = {}
+    Returns:
+        dict: The parsed checksums JSON if successful, None otherwise.
+    """
+    return probe_checksums(version)[1]
 
-    for platform in Platform:
-        filename = platform.get_file_name(version)
+
+def checksum_digest(entry) -> str:
+    """Extract the hex digest from a checksums JSON entry.
+
+    Entries are either the digest itself or an object holding it.
+    """
+    if isinstance(entry, str):
+        return entry
+    if isinstance(entry, dict):
+        for key in ("sha256", "checksum", "hash"):
+            if isinstance(entry.get(key), str):
+                return entry[key]
+    return ""
+
+
+def availability_from_checksums(version: Version, checksums: dict) -> DailyAvailability:
+    # Convert checksums dictionary to a platform availability bitmask
+    mask = 0
+    platform_checksums = {}
+    filenames = version_links(version).filenames
+
+    for platform, bit in PLATFORM_BITS.items():
+        filename = filenames[platform]
         # Check if this filename exists in the checksums
-        is_available = filename in checksums
-        platform_availability[platform] = is_available
+        if filename in checksums:
+            mask |= bit
+            platform_checksums[platform] = checksum_digest(checksums[filename])
+
+    return DailyAvailability(version, mask, platform_checksums)
+
+
+def probe_availability(version: Version) -> tuple[int | None, DailyAvailability | None]:
+    status, checksums = probe_checksums(version)
+    if checksums is None:
+        return status, None
+    return status, availability_from_checksums(version, checksums)
+
+
+def fetch_availability(version: Version) -> DailyAvailability | None:
+    return probe_availability(version)[1]
+
 
-    return DailyAvailability(version, platform_availability)
+def probe_availability_many(
+    versions: Iterable[Version], max_workers: int = PROBE_WORKERS
+) -> Iterator[tuple[Version, int | None, DailyAvailability | None]]:
+    """Probe several versions concurrently.
+
+    Results are yielded in the same order as `versions`, so callers see exactly
+    what a sequential loop over `probe_availability` would produce.
+
+    Args:
+        versions: Versions to probe.
+        max_workers: Number of worker threads (1 = sequential).
+
+    Yields:
+        (version, status, availability) tuples in input order.
+    """
+    if max_workers <= 1:
+        for version in versions:
+            yield version, *probe_availability(version)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        # Submitting while iterating lets probing start before a lazy
+        # `versions` iterable (e.g. a tag walker) is exhausted.
+        futures = [
+            (version, executor.submit(probe_availability, version))
+            for version in versions
+        ]
+        for version, future in futures:
+            yield version, *future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 class bcolors:
@@ -84,10 +180,16 @@ class bcolors:
     ENDC = "\033[0m"
 
 
+HISTORY_FIELDS = ["version", "fetched_at", "platforms", "checksums"]
+
+
 def load_history(path: Path) -> List[DailyRecord]:
     if not path.exists():
         return []
 
+    if sqlite_store.is_sqlite_path(path):
+        return sort_history(sqlite_store.load_history(path))
+
     history: List[DailyRecord] = []
     with path.open("r", encoding="utf-8", newline="") as csv_file:
         reader = csv.DictReader(csv_file)
@@ -97,10 +199,18 @@ def load_history(path: Path) -> List[DailyRecord]:
             except ValueError:
                 continue
 
+            # Rows written before per-platform tracking were all complete builds
+            try:
+                mask = int(row.get("platforms") or ALL_PLATFORMS_MASK) & ALL_PLATFORMS_MASK
+            except ValueError:
+                mask = ALL_PLATFORMS_MASK
+
             history.append(
                 DailyRecord(
                     version=version,
                     fetched_at=row.get("fetched_at", ""),
+                    platforms=mask,
+                    checksums=decode_checksums(mask, row.get("checksums") or ""),
                 )
             )
 
@@ -111,20 +221,30 @@ def save_history(history: List[DailyRecord], path: Path):
     if not history and not path.exists():
         return
 
+    if sqlite_store.is_sqlite_path(path):
+        sqlite_store.save_history(history, path)
+        return
+
     path.parent.mkdir(parents=True, exist_ok=True)
-    fieldnames = ["version", "fetched_at"]
     with path.open("w", encoding="utf-8", newline="") as csv_file:
-        writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
+        writer = csv.DictWriter(csv_file, fieldnames=HISTORY_FIELDS)
         writer.writeheader()
         for record in history:
+            mask = record.get("platforms", ALL_PLATFORMS_MASK)
             writer.writerow(
                 {
                     "version": str(record["version"]),
                     "fetched_at": record.get("fetched_at", ""),
+                    "platforms": mask,
+                    "checksums": encode_checksums(mask, record.get("checksums", {})),
                 }
             )
 
 
+def is_complete(record: DailyRecord) -> bool:
+    return record["platforms"] == ALL_PLATFORMS_MASK
+
+
 def sort_history(history: List[DailyRecord]) -> List[DailyRecord]:
     def sort_key(record: DailyRecord) -> Version:
         return record.get("version")
@@ -152,22 +272,35 @@ def trim_availability(
 def history_to_availability(history: List[DailyRecord]) -> List[DailyAvailability]:
     return [
         DailyAvailability(
-            version=record["version"], available_platforms={p: True for p in Platform}
+            version=record["version"],
+            platforms=record["platforms"],
+            checksums=record["checksums"],
         )
         for record in history
     ]
 
 
-def build_record(version: Version) -> DailyRecord:
-    timestamp = (
-        datetime.now(timezone.utc)
-        .replace(microsecond=0)
-        .isoformat()
-        .replace("+00:00", "Z")
-    )
+def build_record(
+    availability: DailyAvailability, fetched_at: str | None = None
+) -> DailyRecord:
+    """Build a history record from a probe result.
+
+    Args:
+        availability: Probed availability of the version.
+        fetched_at: Time the version was first seen (default: now).
+    """
+    if fetched_at is None:
+        fetched_at = (
+            datetime.now(timezone.utc)
+            .replace(microsecond=0)
+            .isoformat()
+            .replace("+00:00", "Z")
+        )
     return DailyRecord(
-        version=version,
-        fetched_at=timestamp,
+        version=availability.version,
+        fetched_at=fetched_at,
+        platforms=availability.platforms,
+        checksums=dict(availability.checksums),
     )
 
 
@@ -184,31 +317,46 @@ def generate_json_data(availability_list: List[DailyAvailability]) -> dict:
     
     versions = []
     for availability in reversed(availability_list):
-        version_str = str(availability.version)
+        links = version_links(availability.version)
         
-        # Build downloads dictionary organized by system and architecture
+        # Build downloads (and known checksums) organized by system and architecture
         downloads = {}
+        checksums = {}
         for system in System:
             system_downloads = {}
-            for arch in Architecture:
-                try:
-                    platform = Platform.get(system, arch)
-                    if availability.available_platforms[platform]:
-                        system_downloads[arch.value] = platform.url(availability.version)
-                except ValueError:
-                    # Skip invalid system/architecture combinations
-                    pass
+            system_checksums = {}
+            # Only valid system/architecture combinations are listed
+            for platform in SYSTEM_PLATFORMS[system]:
+                if availability.is_available(platform):
+                    system_downloads[platform.architecture.value] = links.urls[platform]
+                    digest = availability.checksums.get(platform)
+                    if digest:
+                        system_checksums[platform.architecture.value] = digest
             if system_downloads:
                 downloads[system.value] = system_downloads
+            if system_checksums:
+                checksums[system.value] = system_checksums
         
-        versions.append({
-            "version": version_str,
-            "release_url": f"https://github.com/posit-dev/positron/releases/tag/{version_str}",
+        entry = {
+            "version": links.version,
+            "release_url": links.release_url,
             "downloads": downloads
-        })
+        }
+        if checksums:
+            # Digests as published in the CDN checksums file, keyed like downloads
+            entry["checksums"] = checksums
+        versions.append(entry)
     
     return {
         "last_updated": current_time,
         "count": len(versions),
         "versions": versions
     }
+
+
+def report_output_status(changed: bool):
+    """Expose whether outputs changed as the `changed` step output in GitHub Actions."""
+    github_output = os.environ.get("GITHUB_OUTPUT")
+    if github_output:
+        with open(github_output, "a", encoding="utf-8") as f:
+            f.write(f"changed={'true' if changed else 'false'}\n")
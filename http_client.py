@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import (
+    HTTP_POOL_SIZE,
+    HTTP_RETRIES,
+    HTTP_BACKOFF,
+    HTTP_TIMEOUT,
+    HTTP_CACHE_DIR,
+)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Response headers kept alongside cached bodies (e.g. pagination links)
+CACHED_HEADERS = ("Link", "Content-Type")
+
+
+class TimeoutSession(requests.Session):
+    """A requests Session that applies a default timeout to every request."""
+
+    def __init__(self, timeout: float) -> None:
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):  # pyrefly: ignore
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def build_session(
+    pool_size: int = HTTP_POOL_SIZE,
+    retries: int = HTTP_RETRIES,
+    backoff: float = HTTP_BACKOFF,
+    timeout: float = HTTP_TIMEOUT,
+) -> requests.Session:
+    """Build a keep-alive session with connection pooling and retries.
+
+    Args:
+        pool_size: Maximum number of pooled connections kept per host.
+        retries: Number of retries for connection errors and transient statuses.
+        backoff: Exponential backoff factor between retries, in seconds.
+        timeout: Default timeout for requests that do not set one.
+
+    Returns:
+        A configured requests Session.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        pool_block=True,
+        max_retries=retry,
+    )
+    session = TimeoutSession(timeout)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session shared by all HTTP callers."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = build_session()
+        return _session
+
+
+@dataclass
+class CachedResponse:
+    """Minimal response object returned by `cached_get`."""
+
+    url: str
+    status_code: int
+    body: str
+    headers: dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error for url: {self.url}")
+
+
+def cache_path(url: str, cache_dir: Path = HTTP_CACHE_DIR) -> Path:
+    """Return the on-disk cache entry path for `url`."""
+    return cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+
+def _load_entry(path: Path) -> dict | None:
+    try:
+        with path.open("r", encoding="utf-8") as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _store_entry(path: Path, entry: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(".part")
+    with temporary.open("w", encoding="utf-8") as cache_file:
+        json.dump(entry, cache_file)
+    os.replace(temporary, path)
+
+
+def cached_get(
+    url: str,
+    headers: dict[str, str] | None = None,
+    cache_dir: Path = HTTP_CACHE_DIR,
+) -> CachedResponse:
+    """GET `url` with a conditional request backed by an on-disk cache.
+
+    The ETag / Last-Modified validators of the previous 200 response are sent
+    as If-None-Match / If-Modified-Since. A 304 response returns the cached body
+    (and, for GitHub, does not count against the rate limit).
+
+    Args:
+        url: URL to fetch.
+        headers: Extra request headers.
+        cache_dir: Directory holding cache entries.
+
+    Returns:
+        A CachedResponse with the fresh or cached body.
+    """
+    path = cache_path(url, cache_dir)
+    entry = _load_entry(path)
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        if entry.get("etag"):
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = get_session().get(url, headers=request_headers)
+
+    if response.status_code == 304 and entry is not None:
+        return CachedResponse(
+            url, 200, entry["body"], entry.get("headers", {}), from_cache=True
+        )
+
+    kept_headers = {
+        name: response.headers[name]
+        for name in CACHED_HEADERS
+        if name in response.headers
+    }
+    if response.status_code == 200 and (
+        "ETag" in response.headers or "Last-Modified" in response.headers
+    ):
+        _store_entry(
+            path,
+            {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "headers": kept_headers,
+                "body": response.text,
+            },
+        )
+
+    return CachedResponse(url, response.status_code, response.text, kept_headers)
@@ -1,5 +1,9 @@
-from typing import List
+from typing import Iterable, Iterator, List
+from functools import lru_cache
+from pathlib import Path
 from datetime import datetime, timezone
+import argparse
+import hashlib
 import os
 import sys
 import json
@@ -12,17 +16,29 @@ from helper import (
     trim_history,
     trim_availability,
     history_to_availability,
-    fetch_availability,
+    is_complete,
+    probe_availability_many,
     build_record,
     bcolors,
     README_TEMPLATE,
     generate_json_data,
+    report_output_status,
 )
-from config import CSV_PATH
-from cusTypes.record import DailyAvailability
+from config import HISTORY_PATH, MAX_HISTORY_ROWS, API_DIR
+from archive import Archive
+from shards import write_shards
+from compress import minify_json, precompress_all, print_stats
+from probe_state import (
+    load_probe_state,
+    save_probe_state,
+    is_eligible,
+    record_probe,
+    prune_probe_state,
+)
+from cusTypes.record import DailyAvailability, DailyRecord
 from cusTypes.version import Version
-from platforms import Platform, System, Architecture
-from git import fetch_latest_versions
+from platforms import Platform, System, SYSTEM_PLATFORMS, version_links
+from git import iter_latest_versions
 
 
 def apt_repository_url() -> str:
@@ -49,126 +65,278 @@ def generate_row(availability: DailyAvailability) -> str:
         A markdown formatted table row string.
     """
 
+    links = version_links(availability.version)
+
     def system_links(system: System) -> str:
         text: str = system.value + "<br>"
         arch_links: list[str] = []
-        for arch in Architecture:
-            try:
-                platform = Platform.get(system, arch)
-                if not availability.available_platforms[platform]:
-                    continue
-                arch_links.append(
-                    f"([{arch.value}]({platform.url(availability.version)}))"
-                )
-            except ValueError:
-                # Skip invalid system/architecture combinations
-                pass
+        # Only valid system/architecture combinations are listed
+        for platform in SYSTEM_PLATFORMS[system]:
+            if not availability.is_available(platform):
+                continue
+            arch_links.append(
+                f"([{platform.architecture.value}]({links.urls[platform]}))"
+            )
         if not arch_links:
             return text + "-"
         return text + " ".join(arch_links)
 
-    links: str = "| ".join(system_links(system) for system in System)
-    return f"| [{str(availability.version)}](https://github.com/posit-dev/positron/releases/tag/{str(availability.version)}) | {links} |\n"
+    cells: str = "| ".join(system_links(system) for system in System)
+    return f"| [{links.version}]({links.release_url}) | {cells} |\n"
+
+
+@lru_cache(maxsize=1)
+def readme_footer() -> str:
+    """Return the static sections below the table (rendered once per process)."""
+    return (
+        "\n## About\n\n"
+        "This list is automatically generated by fetching the GitHub tags and scanning the Positron CDN for available daily builds.\n"
+        "\n## JSON API\n\n"
+        "A machine-readable JSON file with all download links is available at [`dailies.json`](dailies.json). "
+        "This JSON file contains structured data with version information and download URLs for all platforms and architectures. "
+        "Where the CDN publishes checksums, each version also lists them under `checksums`, keyed like `downloads`.\n\n"
+        "Smaller files are available under [`api/`](api): `latest.json` names the newest build, "
+        "`latest/<system>/<arch>.json` points to the newest download for one platform, and "
+        "`versions/<version>.json` holds a single version (listed in `versions/index.json`).\n"
+        "\n## Debian/Ubuntu APT repository\n\n"
+        "The workflow publishes a signed APT repository for the latest x64 and ARM Debian packages. "
+        "After GitHub Pages is enabled with the GitHub Actions source, Ubuntu users can subscribe with:\n\n"
+        "```bash\n"
+        f"curl -fsSL {apt_key_url()} "
+        "| sudo gpg --dearmor -o /usr/share/keyrings/positron-daily-archive-keyring.gpg\n"
+        "ARCH=$(dpkg --print-architecture)\n"
+        f'echo "deb [arch=${{ARCH}} signed-by=/usr/share/keyrings/positron-daily-archive-keyring.gpg] {apt_repository_url()} stable main" '
+        "| sudo tee /etc/apt/sources.list.d/positron-daily.list\n"
+        "sudo apt update\n"
+        "sudo apt install positron\n"
+        "```\n\n"
+        "\n## Data persistence\n\n"
+        "Daily build metadata is cached in `data/dailies.csv`, allowing the script to resume from the "
+        f"last recorded build and limit the history to the {MAX_HISTORY_ROWS} most recent dailies for quick reference. "
+        "Every daily ever seen is kept in the append-only archive `data/archive.jsonl`.\n"
+    )
 
 
-def generate_readme(availability_list: List[DailyAvailability]) -> str:
-    """Generate README.md with a table of available Positron dailies."""
-    current_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+def iter_readme(
+    availability_list: List[DailyAvailability], current_time: str | None = None
+) -> Iterator[str]:
+    """Yield README.md in chunks: header, one chunk per table row, footer.
 
-    readme_content = README_TEMPLATE.format(current_time=current_time) + table_header()
+    Every chunk ends on a line boundary, so memory and time stay linear in the
+    number of rows whether the chunks are joined or streamed to a file.
+    """
+    if current_time is None:
+        current_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+    yield README_TEMPLATE.format(current_time=current_time) + table_header()
 
     if not availability_list:
-        readme_content += (
-            "| No builds available |" + " - |" * len(System) + "\n"
-        )
+        yield "| No builds available |" + " - |" * len(System) + "\n"
     else:
         for availability in reversed(availability_list):
-            readme_content += generate_row(availability)
-
-    readme_content += "\n## About\n\n"
-    readme_content += "This list is automatically generated by fetching the GitHub tags and scanning the Positron CDN for available daily builds.\n"
-    readme_content += "\n## JSON API\n\n"
-    readme_content += "A machine-readable JSON file with all download links is available at [`dailies.json`](dailies.json). "
-    readme_content += "This JSON file contains structured data with version information and download URLs for all platforms and architectures.\n"
-    readme_content += "\n## Debian/Ubuntu APT repository\n\n"
-    readme_content += (
-        "The workflow publishes a signed APT repository for the latest x64 and ARM Debian packages. "
-        "After GitHub Pages is enabled with the GitHub Actions source, Ubuntu users can subscribe with:\n\n"
-    )
-    readme_content += "```bash\n"
-    readme_content += (
-        f"curl -fsSL {apt_key_url()} "
-        "| sudo gpg --dearmor -o /usr/share/keyrings/positron-daily-archive-keyring.gpg\n"
-    )
-    readme_content += "ARCH=$(dpkg --print-architecture)\n"
-    readme_content += (
-        f'echo "deb [arch=${{ARCH}} signed-by=/usr/share/keyrings/positron-daily-archive-keyring.gpg] {apt_repository_url()} stable main" '
-        "| sudo tee /etc/apt/sources.list.d/positron-daily.list\n"
+            yield generate_row(availability)
+
+    yield readme_footer()
+
+
+def generate_readme(availability_list: List[DailyAvailability]) -> str:
+    """Generate README.md with a table of available Positron dailies."""
+    return "".join(iter_readme(availability_list))
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def readme_data_section(content: str) -> str:
+    """Return README content without the volatile "Last updated" line."""
+    return "".join(
+        line
+        for line in content.splitlines(keepends=True)
+        if not line.startswith("Last updated: ")
     )
-    readme_content += "sudo apt update\n"
-    readme_content += "sudo apt install positron\n"
-    readme_content += "```\n\n"
-    readme_content += "\n## Data persistence\n\n"
-    readme_content += (
-        "Daily build metadata is cached in `data/dailies.csv`, allowing the script to resume from the "
-        "last recorded build and limit the history to the 30 most recent dailies for quick reference.\n"
+
+
+def json_data_section(data: dict) -> str:
+    """Return a canonical serialization of JSON data without `last_updated`."""
+    return json.dumps(
+        {key: value for key, value in data.items() if key != "last_updated"},
+        sort_keys=True,
     )
 
-    return readme_content
 
+def readme_file_hash(filename: str) -> str:
+    """Hash the data section of an existing README, reading it line by line."""
+    digest = hashlib.sha256()
+    with open(filename, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.startswith("Last updated: "):
+                digest.update(line.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def write_readme(content: str | Iterable[str], filename: str = "README.md") -> bool:
+    """Stream content to README.md unless only the timestamp would change.
+
+    Args:
+        content: The README text, or chunks ending on line boundaries
+            (see `iter_readme`).
+        filename: Output filename (default: README.md).
+
+    Returns:
+        True if the file was written, False if its data section is unchanged.
+    """
+    chunks = (content,) if isinstance(content, str) else content
+    digest = hashlib.sha256()
+    temporary = filename + ".part"
+    with open(temporary, "w") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            digest.update(readme_data_section(chunk).encode("utf-8"))
+
+    if os.path.exists(filename) and readme_file_hash(filename) == digest.hexdigest():
+        os.remove(temporary)
+        return False
 
-def write_readme(content: str):
-    """Write content to README.md file."""
-    with open("README.md", "w") as f:
-        f.write(content)
+    os.replace(temporary, filename)
+    return True
 
 
-def write_json(data: dict, filename: str = "dailies.json"):
-    """Write JSON data to file.
+def write_json(data: dict, filename: str = "dailies.json") -> bool:
+    """Write JSON data to file unless only `last_updated` would change.
     
     Args:
         data: Dictionary to write as JSON.
         filename: Output filename (default: dailies.json).
+
+    Returns:
+        True if the file was written, False if its data is unchanged.
     """
+    if os.path.exists(filename):
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                existing = json.load(f)
+        except ValueError:
+            existing = None
+        if isinstance(existing, dict) and content_hash(
+            json_data_section(existing)
+        ) == content_hash(json_data_section(data)):
+            return False
+
     with open(filename, "w") as f:
         json.dump(data, f, indent=2)
         f.write("\n")  # Add trailing newline
+    return True
 
 
-def main():
-    history = load_history(CSV_PATH)
-    availability_list = history_to_availability(history)
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Track Positron daily builds and render README.md and dailies.json."
+    )
+    parser.add_argument(
+        "--render-only",
+        action="store_true",
+        help="regenerate README.md and dailies.json from the local history without any network access",
+    )
+    return parser.parse_args()
 
-    # Get existing versions from history to avoid re-checking
-    existing_versions: set[Version] = {record["version"] for record in history}
 
-    # Fetch tags from GitHub
-    print("Fetching version tags from GitHub...")
-    tag_versions = fetch_latest_versions()
+def render_outputs(history: List[DailyRecord]) -> bool:
+    """Render README.md, dailies.json and the sharded JSON API from history records.
 
-    if not tag_versions:
-        raise ConnectionError("No versions found from GitHub tags. Exiting...")
+    Returns:
+        True if any output changed.
+    """
+    availability_list = trim_availability(history_to_availability(history))
 
-    # Filter out versions we already have in history
-    new_versions = [v for v in tag_versions if v not in existing_versions]
+    readme_changed = write_readme(iter_readme(availability_list))
+    print(
+        f"\nREADME.md {'generated' if readme_changed else 'unchanged'} "
+        f"with {len(availability_list)} recorded version(s)."
+    )
+    
+    json_data = generate_json_data(availability_list)
+    json_changed = write_json(json_data)
     print(
-        f"Found {len(tag_versions)} total tags, {len(new_versions)} new versions to check"
+        f"dailies.json {'generated' if json_changed else 'unchanged'} "
+        f"with {len(availability_list)} recorded version(s)."
+    )
+
+    shards_changed = write_shards(json_data)
+    print(f"JSON API shards {'updated' if shards_changed else 'unchanged'}.")
+
+    # Minified and precompressed variants are derived from the files on disk,
+    # so they stay in sync when the writers above skip an unchanged file
+    json_path = Path("dailies.json")
+    minified_path = Path("dailies.min.json")
+    minify_json(json_path, minified_path)
+    print_stats(precompress_all([json_path, minified_path]), "dailies.json variants")
+    print_stats(
+        precompress_all(sorted(API_DIR.rglob("*.json"))), "JSON API shards", detailed=False
     )
 
+    changed = readme_changed or json_changed or shards_changed
+    report_output_status(changed)
+    return changed
+
+
+def main():
+    args = parse_args()
+    history = load_history(HISTORY_PATH)
+
+    if args.render_only:
+        # Local state only: no GitHub or CDN requests
+        render_outputs(history)
+        return 0
+
+    records: dict[Version, DailyRecord] = {record["version"]: record for record in history}
+
+    # Complete builds never change; partial ones are re-probed on their backoff schedule
+    complete_versions: set[Version] = {
+        version for version, record in records.items() if is_complete(record)
+    }
+
+    # Only tags at or above the oldest kept row can make it into the history
+    floor = history[0]["version"] if len(history) >= MAX_HISTORY_ROWS else None
+    tag_versions: list[Version] = []
+
+    # Versions that recently had no (or partial) checksums back off exponentially
+    probe_state = load_probe_state()
+    now = datetime.now(timezone.utc)
+    deferred: list[Version] = []
+    changed_records: list[DailyRecord] = []
+
+    def new_versions() -> Iterator[Version]:
+        # Filter out versions we already have in full; probing starts
+        # while later tag pages are still being fetched
+        for version in iter_latest_versions(MAX_HISTORY_ROWS, floor):
+            tag_versions.append(version)
+            if version in complete_versions:
+                continue
+            if not is_eligible(probe_state, version, now):
+                deferred.append(version)
+                continue
+            yield version
+
+    # Fetch tags from GitHub
+    print("Fetching version tags from GitHub...")
+
     try:
-        for version in new_versions:
-            availability = fetch_availability(version)
+        for version, status, availability in probe_availability_many(new_versions()):
+            record_probe(probe_state, version, status, availability, now)
             if availability is not None:
-                # Add version to final display if checksums exist (even if some platforms are missing)
-                record = build_record(version)
-                availability_list.append(availability)
-                available_count = sum(
-                    1 for p in Platform if availability.available_platforms[p]
+                # Record the version if checksums exist (even if some platforms are missing)
+                previous = records.get(version)
+                record = build_record(
+                    availability, previous["fetched_at"] if previous else None
                 )
-                if available_count == len(Platform):
-                    history.append(
-                        record
-                    )  # Add record to history only if all platforms are available
+                if previous is None or (
+                    previous["platforms"],
+                    previous["checksums"],
+                ) != (record["platforms"], record["checksums"]):
+                    changed_records.append(record)
+                records[version] = record
+                available_count = availability.available_count
                 print(
                     bcolors.OKGREEN
                     + f"{version}: checksums available ({available_count}/{len(Platform)} platforms)"
@@ -180,23 +348,44 @@ def main():
     except KeyboardInterrupt:
         print("\nProcess interrupted by user. Exiting...")
 
-    history = trim_history(sort_history(history))
-    save_history(history, CSV_PATH)
+    if not tag_versions:
+        raise ConnectionError("No versions found from GitHub tags. Exiting...")
+
+    print(
+        f"Checked {len(tag_versions)} tags, "
+        f"{sum(1 for v in tag_versions if v not in complete_versions)} new or partial versions "
+        f"({len(deferred)} deferred by backoff)"
+    )
+
+    # Long-term store: new or changed versions, plus any never archived before
+    archive = Archive()
+    archived = {record["version"] for record in changed_records}
+    archive.append(
+        changed_records
+        + [
+            record
+            for version, record in sorted(records.items())
+            if version not in archived and version not in archive
+        ]
+    )
+    archive.save_index()
+
+    history = trim_history(sort_history(list(records.values())))
+    save_history(history, HISTORY_PATH)
 
-    if history:
+    prune_probe_state(
+        probe_state,
+        history[0]["version"] if len(history) >= MAX_HISTORY_ROWS else None,
+    )
+    save_probe_state(probe_state)
+
+    complete_history = [record for record in history if is_complete(record)]
+    if complete_history:
         print(
-            f"Latest fully available version: {Platform.WINDOWS_SYS.url(history[-1]['version'])}"
+            f"Latest fully available version: {Platform.WINDOWS_SYS.url(complete_history[-1]['version'])}"
         )
 
-    availability_list = trim_availability(availability_list)
-
-    readme_content = generate_readme(availability_list)
-    write_readme(readme_content)
-    print(f"\nREADME.md generated with {len(availability_list)} recorded version(s).")
-    
-    json_data = generate_json_data(availability_list)
-    write_json(json_data)
-    print(f"dailies.json generated with {len(availability_list)} recorded version(s).")
+    render_outputs(history)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,12 @@
 from enum import Enum
+from functools import lru_cache
+from typing import NamedTuple
 from cusTypes.version import Version
 
+RELEASE_URL_TEMPLATE = "https://github.com/posit-dev/positron/releases/tag/{version}"
+# Upper bound on the number of versions whose link bundles are kept
+LINKS_CACHE_SIZE = 16384
+
 class System(Enum):
     WINDOWS_SYS = "Windows (System)"
     WINDOWS_USER = "Windows (User)"
@@ -79,6 +85,9 @@ class Platform(Enum):
         self.architecture = architecture
         self.checksum_template = checksum_template
         self.url_template = url_template
+        # Templates pre-split around "{version}" so formatting is a single join
+        self._file_name_parts = checksum_template.split("{version}")
+        self._url_parts = url_template.split("{version}")
 
     @property
     def filename_template(self) -> str:
@@ -87,16 +96,103 @@ class Platform(Enum):
 
     def get_file_name(self, version: Version) -> str:
         """Format the checksum filename with the given version."""
-        return self.checksum_template.format(version=version)
+        return str(version).join(self._file_name_parts)
 
     def url(self, version: Version) -> str:
         """Generate the download URL for this platform with the given version."""
-        return self.url_template.format(version=str(version))
+        return str(version).join(self._url_parts)
 
     @classmethod
     def get(cls, system: System, architecture: Architecture) -> "Platform":
         """Get the Platform enum member for the given system and architecture."""
-        for platform in cls:
-            if platform.system == system and platform.architecture == architecture:
-                return platform
-        raise ValueError(f"No platform found for {system} {architecture}")
+        platform = PLATFORM_INDEX.get((system, architecture))
+        if platform is None:
+            raise ValueError(f"No platform found for {system} {architecture}")
+        return platform
+
+
+# URL-safe path components used by the sharded JSON API
+SYSTEM_SLUGS: dict[System, str] = {
+    System.WINDOWS_SYS: "windows-system",
+    System.WINDOWS_USER: "windows-user",
+    System.MACOS: "macos",
+    System.DEBIAN: "debian",
+    System.REDHAT: "redhat",
+}
+ARCHITECTURE_SLUGS: dict[Architecture, str] = {
+    Architecture.X64: "x64",
+    Architecture.ARM: "arm64",
+}
+
+# O(1) lookup of the platform for a (System, Architecture) pair
+PLATFORM_INDEX: dict[tuple[System, Architecture], Platform] = {
+    (p.system, p.architecture): p for p in Platform
+}
+# Platforms of each system, in Architecture order
+SYSTEM_PLATFORMS: dict[System, tuple[Platform, ...]] = {
+    system: tuple(
+        PLATFORM_INDEX[(system, arch)]
+        for arch in Architecture
+        if (system, arch) in PLATFORM_INDEX
+    )
+    for system in System
+}
+
+# Bit assigned to each platform in compact availability masks (definition order)
+PLATFORM_BITS: dict[Platform, int] = {p: 1 << i for i, p in enumerate(Platform)}
+ALL_PLATFORMS_MASK: int = (1 << len(PLATFORM_BITS)) - 1
+
+
+def platforms_to_mask(available_platforms: dict[Platform, bool]) -> int:
+    """Encode a platform availability mapping as an integer bitmask."""
+    mask = 0
+    for platform, is_available in available_platforms.items():
+        if is_available:
+            mask |= PLATFORM_BITS[platform]
+    return mask
+
+
+def mask_to_platforms(mask: int) -> dict[Platform, bool]:
+    """Decode an integer bitmask into a full platform availability mapping."""
+    return {p: bool(mask & bit) for p, bit in PLATFORM_BITS.items()}
+
+
+def encode_checksums(mask: int, checksums: dict[Platform, str]) -> str:
+    """Space-separated digests of the platforms set in `mask`, in bit order."""
+    return " ".join(
+        checksums.get(platform) or "-"
+        for platform, bit in PLATFORM_BITS.items()
+        if mask & bit
+    )
+
+
+def decode_checksums(mask: int, value: str) -> dict[Platform, str]:
+    digests = iter(value.split())
+    checksums: dict[Platform, str] = {}
+    for platform, bit in PLATFORM_BITS.items():
+        if mask & bit:
+            digest = next(digests, "-")
+            if digest != "-":
+                checksums[platform] = digest
+    return checksums
+
+
+class VersionLinks(NamedTuple):
+    """All names and URLs of one version, shared by every output stage."""
+
+    version: str
+    release_url: str
+    filenames: dict[Platform, str]
+    urls: dict[Platform, str]
+
+
+@lru_cache(maxsize=LINKS_CACHE_SIZE)
+def version_links(version: Version) -> VersionLinks:
+    """Return the (cached) link bundle for `version`, formatted once per version."""
+    version_str = str(version)
+    return VersionLinks(
+        version=version_str,
+        release_url=RELEASE_URL_TEMPLATE.format(version=version_str),
+        filenames={p: version_str.join(p._file_name_parts) for p in Platform},
+        urls={p: version_str.join(p._url_parts) for p in Platform},
+    )
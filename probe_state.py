@@ -0,0 +1,144 @@
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from config import (
+    PROBE_STATE_PATH,
+    PROBE_BACKOFF_BASE_HOURS,
+    PROBE_BACKOFF_MAX_HOURS,
+    PROBE_PARTIAL_MAX_HOURS,
+)
+from cusTypes.record import DailyAvailability, ProbeState
+from cusTypes.version import Version
+from platforms import Platform
+
+
+def format_time(moment: datetime) -> str:
+    return moment.replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def load_probe_state(path: Path = PROBE_STATE_PATH) -> dict[Version, ProbeState]:
+    """Load the probe state store, ignoring unreadable files and entries."""
+    if not path.exists():
+        return {}
+
+    try:
+        with path.open("r", encoding="utf-8") as state_file:
+            raw = json.load(state_file)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable probe state {path}: {e}")
+        return {}
+
+    state: dict[Version, ProbeState] = {}
+    for entry in raw.get("versions", []):
+        try:
+            version = Version.from_string(entry["version"])
+            state[version] = ProbeState(
+                version=version,
+                last_probed=entry["last_probed"],
+                status=entry.get("status"),
+                platforms_found=list(entry.get("platforms_found", [])),
+                next_eligible=entry["next_eligible"],
+                attempts=int(entry.get("attempts", 1)),
+            )
+        except (KeyError, TypeError, ValueError):
+            continue
+    return state
+
+
+def save_probe_state(
+    state: dict[Version, ProbeState], path: Path = PROBE_STATE_PATH
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entries = [
+        {**entry, "version": str(entry["version"])}
+        for _, entry in sorted(state.items())
+    ]
+    temporary = path.with_suffix(".part")
+    with temporary.open("w", encoding="utf-8") as state_file:
+        json.dump({"versions": entries}, state_file, indent=2)
+        state_file.write("\n")
+    os.replace(temporary, path)
+
+
+def is_eligible(
+    state: dict[Version, ProbeState], version: Version, now: datetime
+) -> bool:
+    """Return True if `version` has never been probed or its backoff has expired."""
+    entry = state.get(version)
+    return entry is None or parse_time(entry["next_eligible"]) <= now
+
+
+def backoff_delay(attempts: int, partial: bool) -> timedelta:
+    """Exponential backoff: base * 2^(attempts - 1), capped.
+
+    Partial builds are capped much lower than missing ones, since the
+    remaining platforms usually show up within a day.
+    """
+    cap = PROBE_PARTIAL_MAX_HOURS if partial else PROBE_BACKOFF_MAX_HOURS
+    hours = PROBE_BACKOFF_BASE_HOURS * 2 ** max(0, attempts - 1)
+    return timedelta(hours=min(hours, cap))
+
+
+def is_transient(status: int | None) -> bool:
+    """Return True for probe failures that say nothing about the build.
+
+    Network errors (None), rate limiting (429) and server errors (5xx) still
+    failing after the HTTP client's retries are transient; only real "not
+    published" answers such as 404 or 403 count as attempts.
+    """
+    return status is None or status == 429 or status >= 500
+
+
+def record_probe(
+    state: dict[Version, ProbeState],
+    version: Version,
+    status: int | None,
+    availability: DailyAvailability | None,
+    now: datetime,
+) -> None:
+    """Record the outcome of a probe.
+
+    Complete versions are dropped from the store (they live in the history);
+    missing or partial ones are scheduled for a later re-check. A transient
+    failure (see `is_transient`) says nothing about the build, so it neither
+    counts as an attempt nor forgets the platforms found by an earlier probe.
+    """
+    if availability is not None and availability.is_complete:
+        state.pop(version, None)
+        return
+
+    previous = state.get(version)
+    if availability is not None:
+        found = [p.name for p in Platform if availability.is_available(p)]
+    elif previous is not None:
+        found = previous["platforms_found"]
+    else:
+        found = []
+
+    attempts = previous["attempts"] if previous is not None else 0
+    if not is_transient(status):
+        attempts += 1
+    state[version] = ProbeState(
+        version=version,
+        last_probed=format_time(now),
+        status=status,
+        platforms_found=found,
+        next_eligible=format_time(now + backoff_delay(attempts, bool(found))),
+        attempts=attempts,
+    )
+
+
+def prune_probe_state(
+    state: dict[Version, ProbeState], floor: Version | None
+) -> None:
+    """Forget versions that can no longer enter the history."""
+    if floor is None:
+        return
+    for version in [v for v in state if v < floor]:
+        del state[version]
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from compress import COMPRESSED_SUFFIXES
+from config import API_DIR
+from platforms import System, Architecture, SYSTEM_SLUGS, ARCHITECTURE_SLUGS
+
+
+def serialize(data: dict) -> bytes:
+    """Compact, deterministic JSON so unchanged shards stay byte-identical."""
+    return (json.dumps(data, separators=(",", ":"), sort_keys=True) + "\n").encode(
+        "utf-8"
+    )
+
+
+def version_shard_path(version: str) -> str:
+    return f"versions/{version}.json"
+
+
+def build_shards(json_data: dict) -> dict[str, bytes]:
+    """Split dailies.json data into small shard files.
+
+    Layout (relative to the API root):
+        latest.json                   newest version and the hash of its shard
+        latest/<system>/<arch>.json   newest download for one platform
+        versions/<version>.json       one version, as in dailies.json
+        versions/index.json           every shard with its content hash
+
+    No shard carries a timestamp, so a file only changes when its data does.
+
+    Args:
+        json_data: Data produced by `generate_json_data` (newest first).
+
+    Returns:
+        Mapping of relative path to file content.
+    """
+    shards: dict[str, bytes] = {}
+    index: list[dict] = []
+    latest_platforms: dict[str, dict] = {}
+
+    for entry in json_data["versions"]:
+        path = version_shard_path(entry["version"])
+        content = serialize(entry)
+        shards[path] = content
+        index.append(
+            {
+                "version": entry["version"],
+                "path": path,
+                "sha256": hashlib.sha256(content).hexdigest(),
+            }
+        )
+
+        checksums = entry.get("checksums", {})
+        for system_name, system_downloads in entry["downloads"].items():
+            for arch_name, url in system_downloads.items():
+                key = (
+                    f"latest/{SYSTEM_SLUGS[System(system_name)]}/"
+                    f"{ARCHITECTURE_SLUGS[Architecture(arch_name)]}.json"
+                )
+                # Versions are newest first, so the first hit is the latest
+                if key not in latest_platforms:
+                    latest_platforms[key] = {
+                        "version": entry["version"],
+                        "url": url,
+                        "shard": path,
+                    }
+                    digest = checksums.get(system_name, {}).get(arch_name)
+                    if digest:
+                        latest_platforms[key]["checksum"] = digest
+
+    for path, redirect in latest_platforms.items():
+        shards[path] = serialize(redirect)
+
+    shards["versions/index.json"] = serialize({"versions": index})
+    if index:
+        shards["latest.json"] = serialize(
+            {
+                "version": index[0]["version"],
+                "shard": index[0]["path"],
+                "sha256": index[0]["sha256"],
+            }
+        )
+
+    return shards
+
+
+def write_shards(json_data: dict, root: Path = API_DIR) -> bool:
+    """Write the sharded API, touching only files whose content changed.
+
+    Shards of versions that left the window are removed, along with their
+    precompressed siblings.
+
+    Returns:
+        True if any file was written or removed.
+    """
+    shards = build_shards(json_data)
+    changed = False
+
+    for relative, content in shards.items():
+        path = root / relative
+        if path.exists() and path.read_bytes() == content:
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(".part")
+        temporary.write_bytes(content)
+        os.replace(temporary, path)
+        changed = True
+
+    if root.exists():
+        for path in root.rglob("*.json"):
+            if path.relative_to(root).as_posix() not in shards:
+                path.unlink()
+                changed = True
+        for suffix in COMPRESSED_SUFFIXES:
+            for path in root.rglob(f"*.json{suffix}"):
+                if path.with_suffix("").relative_to(root).as_posix() not in shards:
+                    path.unlink()
+
+    return changed
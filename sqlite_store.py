@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+from config import CSV_PATH, SQLITE_PATH
+from cusTypes.record import DailyRecord
+from cusTypes.version import Version
+from platforms import ALL_PLATFORMS_MASK, encode_checksums, decode_checksums
+
+SQLITE_SUFFIXES = {".sqlite", ".sqlite3", ".db"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dailies (
+    version TEXT PRIMARY KEY,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    type INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    fetched_at TEXT NOT NULL,
+    platforms INTEGER NOT NULL,
+    checksums TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dailies_order ON dailies (year, month, type, number);
+"""
+
+UPSERT = """
+INSERT INTO dailies (version, year, month, type, number, fetched_at, platforms, checksums)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (version) DO UPDATE SET
+    platforms = excluded.platforms,
+    checksums = excluded.checksums
+"""
+
+
+def is_sqlite_path(path: Path) -> bool:
+    return path.suffix in SQLITE_SUFFIXES
+
+
+def connect(path: Path = SQLITE_PATH) -> sqlite3.Connection:
+    """Open the state database in WAL mode, creating the schema if needed.
+
+    WAL lets readers (render-only runs, the APT builder) proceed while the
+    fetcher holds a write transaction.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def _row(record: DailyRecord) -> tuple:
+    version: Version = record["version"]
+    mask = record.get("platforms", ALL_PLATFORMS_MASK)
+    return (
+        str(version),
+        version.year,
+        version.month,
+        version.type,
+        version.number,
+        record.get("fetched_at", ""),
+        mask,
+        encode_checksums(mask, record.get("checksums", {})),
+    )
+
+
+def _record(row: tuple) -> DailyRecord | None:
+    version, fetched_at, mask, checksums = row
+    try:
+        parsed = Version.from_string(version)
+    except ValueError:
+        return None
+    return DailyRecord(
+        version=parsed,
+        fetched_at=fetched_at,
+        platforms=mask,
+        checksums=decode_checksums(mask, checksums),
+    )
+
+
+def load_history(path: Path = SQLITE_PATH) -> list[DailyRecord]:
+    with closing(connect(path)) as connection:
+        rows = connection.execute(
+            "SELECT version, fetched_at, platforms, checksums FROM dailies "
+            "ORDER BY year, month, type, number"
+        ).fetchall()
+    return [record for record in map(_record, rows) if record is not None]
+
+
+def get_record(version: Version, path: Path = SQLITE_PATH) -> DailyRecord | None:
+    """Look up one version by its indexed key."""
+    with closing(connect(path)) as connection:
+        row = connection.execute(
+            "SELECT version, fetched_at, platforms, checksums FROM dailies WHERE version = ?",
+            (str(version),),
+        ).fetchone()
+    return _record(row) if row is not None else None
+
+
+def upsert_records(records: list[DailyRecord], path: Path = SQLITE_PATH) -> None:
+    """Insert or update probe results in a single transaction."""
+    with closing(connect(path)) as connection:
+        with connection:
+            connection.executemany(UPSERT, [_row(record) for record in records])
+
+
+def save_history(history: list[DailyRecord], path: Path = SQLITE_PATH) -> None:
+    """Make the table hold exactly `history`, in a single transaction."""
+    with closing(connect(path)) as connection:
+        with connection:
+            connection.executemany(UPSERT, [_row(record) for record in history])
+            keep = {str(record["version"]) for record in history}
+            stale = [
+                (version,)
+                for (version,) in connection.execute("SELECT version FROM dailies")
+                if version not in keep
+            ]
+            connection.executemany("DELETE FROM dailies WHERE version = ?", stale)
+
+
+def migrate_csv(csv_path: Path = CSV_PATH, db_path: Path = SQLITE_PATH) -> int:
+    """Copy every row of the CSV history into the database.
+
+    Returns:
+        The number of rows migrated.
+    """
+    # Imported here: helper dispatches to this module for .sqlite paths
+    from helper import load_history as load_csv_history
+
+    if not csv_path.exists():
+        raise FileNotFoundError(f"History file not found: {csv_path}")
+    history = load_csv_history(csv_path)
+    upsert_records(history, db_path)
+    return len(history)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Migrate the CSV daily history into the SQLite state store."
+    )
+    parser.add_argument("--csv", type=Path, default=CSV_PATH)
+    parser.add_argument("--db", type=Path, default=SQLITE_PATH)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    count = migrate_csv(args.csv, args.db)
+    print(f"Migrated {count} record(s) from {args.csv} to {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# Keep the HTTP and download caches written by the code under test out of
+# the working tree. This must run before `config` is first imported.
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="positron-daily-tests-"))
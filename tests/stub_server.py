@@ -0,0 +1,209 @@
+"""Local HTTP servers standing in for the CDN and the GitHub API in tests."""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class StubServer:
+    """Run `handler` on an ephemeral localhost port for the duration of a `with`.
+
+    Each server gets its own handler subclass, so class-level state set via
+    `attributes` (served files, failure knobs, request log) is not shared.
+    """
+
+    def __init__(self, handler: type[BaseHTTPRequestHandler], **attributes) -> None:
+        self.handler = type(handler.__name__, (handler,), dict(attributes))
+        self.handler.requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    @property
+    def requests(self) -> list[tuple[str, str, str | None]]:
+        """(method, path, detail) of every request received so far.
+
+        `detail` is handler specific: the Range header for RangeFileHandler,
+        the response status of REST requests for GitHubHandler.
+        """
+        return self.handler.requests
+
+    def __enter__(self) -> "StubServer":
+        threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class RangeFileHandler(BaseHTTPRequestHandler):
+    """Serve in-memory files with HTTP Range support and injectable faults.
+
+    Attributes:
+        files: Path -> content.
+        drop_after: Close the connection after this many body bytes of the
+            first full (non-Range) GET of each file.
+        ignore_range: Answer every GET with the whole file and status 200.
+        accept_ranges: Advertise `Accept-Ranges: bytes` on HEAD.
+    """
+
+    files: dict[str, bytes] = {}
+    drop_after: int | None = None
+    ignore_range = False
+    accept_ranges = True
+    requests: list[tuple[str, str, str | None]]
+    _dropped: set[str]
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _content(self) -> bytes | None:
+        self.requests.append((self.command, self.path, self.headers.get("Range")))
+        content = self.files.get(self.path)
+        if content is None:
+            self.send_error(404)
+        return content
+
+    def do_HEAD(self) -> None:
+        content = self._content()
+        if content is None:
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        if self.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        content = self._content()
+        if content is None:
+            return
+
+        size = len(content)
+        start, end = 0, size - 1
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range") or "")
+        if match and not self.ignore_range:
+            start = int(match[1])
+            end = min(int(match[2]), size - 1) if match[2] else size - 1
+            if start >= size:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+
+        body = content[start : end + 1]
+        handler = type(self)
+        if "_dropped" not in handler.__dict__:
+            handler._dropped = set()
+        if self.drop_after is not None and not match and self.path not in self._dropped:
+            self._dropped.add(self.path)
+            self.wfile.write(body[: self.drop_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+class GitHubHandler(BaseHTTPRequestHandler):
+    """Serve a tag list through the REST tags endpoint and the GraphQL API.
+
+    Like GitHub, the REST endpoint pages through tags sorted by name (so
+    "2026.09.0-99" comes before "2026.09.0-139") and honours If-None-Match,
+    while the GraphQL refs query returns them in release order.
+
+    Attributes:
+        tags: Tag names in release order, newest first.
+        latency: Seconds to wait before answering, to mimic a remote API.
+    """
+
+    tags: list[str] = []
+    latency = 0.0
+    requests: list[tuple[str, str, str | None]]
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send_json(self, payload, headers: dict[str, str] | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        time.sleep(self.latency)
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if not re.fullmatch(r"/repos/[^/]+/[^/]+/tags", url.path):
+            self.requests.append(("GET", self.path, None))
+            self.send_error(404)
+            return
+
+        per_page = int(query.get("per_page", ["30"])[0])
+        page = int(query.get("page", ["1"])[0])
+        names = sorted(self.tags, reverse=True)
+        payload = [
+            {"name": name} for name in names[(page - 1) * per_page : page * per_page]
+        ]
+        digest = hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest()
+        etag = f'"{digest[:16]}"'
+
+        if self.headers.get("If-None-Match") == etag:
+            self.requests.append(("GET", self.path, "304"))
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.requests.append(("GET", self.path, "200"))
+        headers = {"ETag": etag}
+        if page * per_page < len(names):
+            next_url = (
+                f"http://{self.headers['Host']}{url.path}"
+                f"?per_page={per_page}&page={page + 1}"
+            )
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        self._send_json(payload, headers)
+
+    def do_POST(self) -> None:
+        time.sleep(self.latency)
+        self.requests.append(("POST", self.path, None))
+        if self.path != "/graphql":
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length", "0"))
+        variables = json.loads(self.rfile.read(length))["variables"]
+        start = int(variables.get("after") or 0)
+        end = start + int(variables["first"])
+        self._send_json(
+            {
+                "data": {
+                    "repository": {
+                        "refs": {
+                            "pageInfo": {
+                                "hasNextPage": end < len(self.tags),
+                                "endCursor": str(end),
+                            },
+                            "nodes": [{"name": name} for name in self.tags[start:end]],
+                        }
+                    }
+                }
+            }
+        )
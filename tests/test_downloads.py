@@ -0,0 +1,129 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import build_apt_repo
+from build_apt_repo import DOWNLOAD_CHUNK_SIZE, download_file
+
+from tests.stub_server import RangeFileHandler, StubServer
+
+
+PATH = "/deb/Positron-2026.09.0-128-x64.deb"
+CONTENT = os.urandom(3 * DOWNLOAD_CHUNK_SIZE + 12345)
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+
+
+class DownloadFileTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.destination = Path(self.directory.name) / "package.deb"
+        self.part = self.destination.with_name("package.deb.part")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def serve(self, **attributes) -> StubServer:
+        return StubServer(RangeFileHandler, files={PATH: CONTENT}, **attributes)
+
+    def assert_downloaded(self, digests) -> None:
+        self.assertEqual(self.destination.read_bytes(), CONTENT)
+        self.assertEqual(digests.size, len(CONTENT))
+        self.assertEqual(digests.hashes["sha256"], SHA256)
+        self.assertEqual(digests.hashes["md5"], hashlib.md5(CONTENT).hexdigest())
+        self.assertEqual(digests.hashes["sha1"], hashlib.sha1(CONTENT).hexdigest())
+        self.assertEqual(list(Path(self.directory.name).iterdir()), [self.destination])
+
+    def test_plain_download_hashes_while_streaming(self) -> None:
+        with self.serve() as server:
+            digests = download_file(server.url + PATH, self.destination, SHA256)
+        self.assert_downloaded(digests)
+        self.assertEqual(server.requests, [("GET", PATH, None)])
+
+    def test_dropped_stream_resumes_with_range(self) -> None:
+        drop_after = 2 * DOWNLOAD_CHUNK_SIZE + 100
+        with self.serve(drop_after=drop_after) as server:
+            digests = download_file(server.url + PATH, self.destination, SHA256)
+        self.assert_downloaded(digests)
+        # Only whole chunks reach the .part file before the drop.
+        self.assertEqual(
+            server.requests,
+            [("GET", PATH, None), ("GET", PATH, f"bytes={2 * DOWNLOAD_CHUNK_SIZE}-")],
+        )
+
+    def test_leftover_part_is_resumed(self) -> None:
+        self.part.write_bytes(CONTENT[:1000])
+        with self.serve() as server:
+            digests = download_file(server.url + PATH, self.destination, SHA256)
+        self.assert_downloaded(digests)
+        self.assertEqual(server.requests, [("GET", PATH, "bytes=1000-")])
+
+    def test_complete_part_is_accepted_on_416(self) -> None:
+        self.part.write_bytes(CONTENT)
+        with self.serve() as server:
+            digests = download_file(server.url + PATH, self.destination, SHA256)
+        self.assert_downloaded(digests)
+
+    def test_server_ignoring_range_restarts_from_zero(self) -> None:
+        self.part.write_bytes(CONTENT[:1000])
+        with self.serve(ignore_range=True) as server:
+            digests = download_file(server.url + PATH, self.destination, SHA256)
+        self.assert_downloaded(digests)
+
+    def test_checksum_mismatch_removes_part(self) -> None:
+        with self.serve() as server:
+            with self.assertRaisesRegex(ValueError, "Checksum mismatch"):
+                download_file(server.url + PATH, self.destination, "0" * 64)
+        self.assertFalse(self.part.exists())
+        self.assertFalse(self.destination.exists())
+
+    def test_segmented_download(self) -> None:
+        with mock.patch.object(build_apt_repo, "MIN_SEGMENT_SIZE", DOWNLOAD_CHUNK_SIZE):
+            with self.serve() as server:
+                digests = download_file(
+                    server.url + PATH, self.destination, SHA256, segments=3
+                )
+        self.assert_downloaded(digests)
+        ranges = sorted(header for method, _, header in server.requests if method == "GET")
+        self.assertEqual(len(ranges), 3)
+        self.assertTrue(all(header.startswith("bytes=") for header in ranges))
+
+    def test_segmented_download_resumes_sidecars(self) -> None:
+        with mock.patch.object(build_apt_repo, "MIN_SEGMENT_SIZE", DOWNLOAD_CHUNK_SIZE):
+            (first, _), (second, _) = build_apt_repo.split_ranges(len(CONTENT), 2)
+            sidecar = self.part.with_name(f"{self.part.name}.{second}")
+            sidecar.write_bytes(CONTENT[second : second + 500])
+            with self.serve() as server:
+                digests = download_file(
+                    server.url + PATH, self.destination, SHA256, segments=2
+                )
+        self.assert_downloaded(digests)
+        self.assertIn(("GET", PATH, f"bytes={second + 500}-{len(CONTENT) - 1}"), server.requests)
+
+    def test_part_past_first_range_falls_back_to_single_stream(self) -> None:
+        self.part.write_bytes(CONTENT[: 2 * DOWNLOAD_CHUNK_SIZE])
+        with mock.patch.object(build_apt_repo, "MIN_SEGMENT_SIZE", DOWNLOAD_CHUNK_SIZE):
+            with self.serve() as server:
+                digests = download_file(
+                    server.url + PATH, self.destination, SHA256, segments=2
+                )
+        self.assert_downloaded(digests)
+        self.assertEqual(
+            [request for request in server.requests if request[0] == "GET"],
+            [("GET", PATH, f"bytes={2 * DOWNLOAD_CHUNK_SIZE}-")],
+        )
+
+    def test_server_without_ranges_is_not_segmented(self) -> None:
+        with mock.patch.object(build_apt_repo, "MIN_SEGMENT_SIZE", DOWNLOAD_CHUNK_SIZE):
+            with self.serve(accept_ranges=False) as server:
+                digests = download_file(
+                    server.url + PATH, self.destination, SHA256, segments=3
+                )
+        self.assert_downloaded(digests)
+        self.assertEqual(server.requests[-1], ("GET", PATH, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import git
+import main
+from cusTypes.version import Version
+from git import GraphQLTagSource, RestTagSource, fetch_latest_versions
+
+from tests.stub_server import GitHubHandler, StubServer
+
+
+def synthetic_tags() -> list[str]:
+    """Daily tags of two releases plus non-daily tags, newest first."""
+    dailies = [f"2026.08.0-{number}" for number in range(1, 71)]
+    dailies += [f"2026.09.0-{number}" for number in range(1, 140)]
+    tags = [str(version) for version in sorted(Version.parse_many(dailies), reverse=True)]
+    return tags[:50] + ["v2026.09.0", "latest"] + tags[50:]
+
+
+TAGS = synthetic_tags()
+NEWEST = sorted(Version.parse_many(TAGS), reverse=True)
+PER_PAGE = 25
+
+
+class StubGitHubTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = StubServer(GitHubHandler, tags=TAGS)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    def sources(self) -> dict[str, RestTagSource | GraphQLTagSource]:
+        return {
+            "rest": RestTagSource(self.server.url, PER_PAGE),
+            "graphql": GraphQLTagSource(self.server.url, PER_PAGE),
+        }
+
+
+class TagSourceTest(StubGitHubTestCase):
+    def test_sources_agree_on_newest_versions(self) -> None:
+        for floor in (None, NEWEST[60], NEWEST[10]):
+            for name, source in self.sources().items():
+                with self.subTest(source=name, floor=floor):
+                    expected = [v for v in NEWEST if floor is None or v >= floor][:30]
+                    self.assertEqual(fetch_latest_versions(30, floor, source), expected)
+
+    def test_graphql_stops_early(self) -> None:
+        fetch_latest_versions(30, None, self.sources()["graphql"])
+        posts = [request for request in self.server.requests if request[0] == "POST"]
+        self.assertEqual(len(posts), 2)
+
+    def test_rest_reads_every_page_and_revalidates(self) -> None:
+        pages = -(-len(TAGS) // PER_PAGE)
+        fetch_latest_versions(30, None, self.sources()["rest"])
+        fetch_latest_versions(30, None, self.sources()["rest"])
+        statuses = [status for _, _, status in self.server.requests]
+        self.assertEqual(statuses, ["200"] * pages + ["304"] * pages)
+
+
+class MainVersionSelectionTest(StubGitHubTestCase):
+    """Drive `main.main()` with no history, so tags are walked without a floor."""
+
+    def run_main(self, source: RestTagSource | GraphQLTagSource, rows: int) -> list[Version]:
+        probed: list[Version] = []
+
+        def probe_availability_many(versions):
+            for version in versions:
+                probed.append(version)
+                yield version, 404, None
+
+        with (
+            mock.patch.object(git, "get_tag_source", return_value=source),
+            mock.patch.object(main, "MAX_HISTORY_ROWS", rows),
+            mock.patch.object(main, "probe_availability_many", probe_availability_many),
+            mock.patch.object(main, "load_history", return_value=[]),
+            mock.patch.object(main, "load_probe_state", return_value={}),
+            mock.patch.object(main, "save_probe_state"),
+            mock.patch.object(main, "save_history"),
+            mock.patch.object(main, "render_outputs"),
+            mock.patch.object(main, "Archive"),
+            mock.patch("sys.argv", ["main.py"]),
+            redirect_stdout(io.StringIO()),
+        ):
+            main.main()
+        return probed
+
+    def test_without_floor_only_newest_versions_are_probed(self) -> None:
+        for rows in (30, 60):
+            for name, source in self.sources().items():
+                with self.subTest(source=name, rows=rows):
+                    probed = self.run_main(source, rows)
+                    self.assertEqual(sorted(probed, reverse=True), NEWEST[:rows])
+
+
+if __name__ == "__main__":
+    unittest.main()